@@ -0,0 +1,105 @@
+"""
+Memory / wall-time comparison of the NetworkX and compact (CSR array) import graph backends.
+
+Builds a synthetic layered import graph of N packages, then times graph construction,
+topological ordering, unresolved-import lookup and one transitive reverse-dependency query.
+Each backend runs in a fresh subprocess so ru_maxrss is not polluted by the other one.
+
+    pip install -e . && python benchmarks/bench_graph_backend.py --packages 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import time
+from typing import Iterator, List, Tuple
+
+
+def _imports(n: int, fanout: int, seed: int) -> Iterator[Tuple[str, List[str]]]:
+    rng = random.Random(seed)
+    for i in range(n):
+        deps = {f"P{rng.randrange(i)}" for _ in range(min(i, fanout))} if i else set()
+        if i % 100 == 0:
+            deps.add("ScalarValues")  # standard library import, never defined
+        yield f"P{i}", sorted(deps)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run_backend(backend: str, n: int, fanout: int) -> None:
+    from windseeker.graph import (
+        build_import_graph_from_package_text,
+        get_unresolved_imports,
+        reverse_dependencies,
+        topological_packages,
+    )
+    from windseeker.packages import PackageRecord
+
+    records = [
+        PackageRecord(name=name, path="", start=0, end=0, content_hash="", imports=tuple(deps))
+        for name, deps in _imports(n, fanout, seed=1)
+    ]
+    base = _peak_rss_mb()
+
+    t0 = time.perf_counter()
+    G = build_import_graph_from_package_text(iter(records), backend=backend)
+    t_build = time.perf_counter() - t0
+    rss_graph = _peak_rss_mb() - base
+
+    t0 = time.perf_counter()
+    order = topological_packages(G)
+    t_topo = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    unresolved = get_unresolved_imports(G)
+    t_unres = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    affected = reverse_dependencies(G, f"P{n // 2}")
+    t_rdeps = time.perf_counter() - t0
+
+    print(
+        f"{backend:9s} nodes={len(order):7d} build={t_build:6.2f}s topo={t_topo:6.2f}s "
+        f"unresolved={t_unres:6.3f}s ({len(unresolved)}) rdeps={t_rdeps:6.3f}s "
+        f"({len(affected)}) graph_rss={rss_graph:7.1f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--packages", type=int, default=100_000, help="Number of packages")
+    parser.add_argument("--fanout", type=int, default=4, help="Imports per package")
+    parser.add_argument("--backend", choices=["networkx", "compact"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        _run_backend(args.backend, args.packages, args.fanout)
+        return
+
+    print(f"{args.packages} packages, {args.fanout} imports each")
+    for backend in ("networkx", "compact"):
+        subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--backend",
+                backend,
+                "--packages",
+                str(args.packages),
+                "--fanout",
+                str(args.fanout),
+            ],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Peak-RSS / wall-time benchmark for scanning large generated .sysml files.
+
+Compares the previous str-based reading path (read_text + strip_line_comments, then
+extracting packages, imports and views from the stripped copy) with scan_folder's
+mmap/bytes path. Each mode runs in a fresh
+subprocess so ru_maxrss is not polluted by the other mode.
+
+    pip install -e . && python benchmarks/bench_scan_memory.py --mb 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _generate(folder: Path, total_mb: int, files: int) -> None:
+    chunk = (
+        "package P{i} {{\n"
+        "    // generated package {i}\n"
+        "    private import P{j}::*;\n"
+        "    package Inner {{\n"
+        + "        part def Part{i} {{ attribute mass : Real; /* generated */ }}\n"
+        * 20
+        + "        view V{i} {{ expose P{i}::Inner::**; }}\n"
+        "    }}\n"
+        "}}\n"
+    )
+    per_file = total_mb * 1024 * 1024 // files
+    i = 0
+    for f in range(files):
+        parts = []
+        size = 0
+        while size < per_file:
+            s = chunk.format(i=i, j=max(0, i - 1))
+            parts.append(s)
+            size += len(s)
+            i += 1
+        (folder / f"gen_{f}.sysml").write_text("".join(parts), encoding="utf-8")
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run_mode(mode: str, folder: str) -> None:
+    from windseeker.parsing import (
+        collect_views_from_top_level_package_text,
+        extract_top_level_packages_with_text,
+        parse_imports_from_package_text,
+        strip_line_comments,
+    )
+    from windseeker.scan import scan_folder
+
+    base = _peak_rss_mb()
+    t0 = time.perf_counter()
+    if mode == "text":
+        package_text, imports, views = {}, {}, {}
+        for path in Path(folder).rglob("*.sysml"):
+            text = path.read_text(encoding="utf-8", errors="replace")
+            clean_text = strip_line_comments(text)
+            for name, body in extract_top_level_packages_with_text(clean_text):
+                if name not in package_text:
+                    package_text[name] = body
+                    imports[name] = parse_imports_from_package_text(name, body)
+                    views[name] = collect_views_from_top_level_package_text(name, body)
+        count = len(package_text)
+    else:
+        count = len(scan_folder(folder))
+    elapsed = time.perf_counter() - t0
+    print(
+        f"{mode:6s} packages={count:8d} time={elapsed:7.2f}s peak_rss_delta={_peak_rss_mb() - base:8.1f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=int, default=32, help="Total generated model size in MB")
+    parser.add_argument("--files", type=int, default=4, help="Number of generated files")
+    parser.add_argument("--mode", choices=["text", "mmap"], help=argparse.SUPPRESS)
+    parser.add_argument("--folder", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        _run_mode(args.mode, args.folder)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _generate(Path(tmp), args.mb, args.files)
+        print(f"{args.mb} MB in {args.files} file(s)")
+        for mode in ("text", "mmap"):
+            subprocess.run([sys.executable, __file__, "--mode", mode, "--folder", tmp], check=True)
+
+
+if __name__ == "__main__":
+    main()
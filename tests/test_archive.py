@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from windseeker.scan import scan_folder
+
+MODEL = {
+    "model/a.sysml": "package A { import B::*; }\n",
+    "model/sub/b.sysml": "// lib\npackage B;\n",
+    "model/notes.txt": "package NotSysml;",
+    "model/.git/c.sysml": "package Git;",
+}
+
+
+def _make_zip(path: Path) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, text in MODEL.items():
+            zf.writestr(name, text)
+    return path
+
+
+def _make_tar(path: Path, tmp_path: Path) -> Path:
+    src = tmp_path / "src"
+    for name, text in MODEL.items():
+        (src / name).parent.mkdir(parents=True, exist_ok=True)
+        (src / name).write_text(text, encoding="utf-8")
+    with tarfile.open(path, "w:gz") as tf:
+        tf.add(src / "model", arcname="./model")
+    return path
+
+
+@pytest.mark.parametrize("kind", ["zip", "tar.gz"])
+def test_scan_archive_matches_filesystem_scan(tmp_path: Path, kind: str) -> None:
+    if kind == "zip":
+        archive = _make_zip(tmp_path / "model.zip")
+    else:
+        archive = _make_tar(tmp_path / "model.tar.gz", tmp_path)
+
+    package_text = scan_folder(str(archive))
+
+    assert set(package_text) == {"A", "B"}
+    assert package_text.imports_of("A") == ["B"]
+    assert package_text["A"] == "package A { import B::*; }"
+    assert package_text["B"] == "package B;"
+    assert package_text.record("B").source.endswith("model/sub/b.sysml")
+
+
+def test_scan_archive_honors_exclude(tmp_path: Path) -> None:
+    archive = _make_zip(tmp_path / "model.zip")
+
+    assert set(scan_folder(str(archive), exclude=["sub/"])) == {"A"}
+
+
+@pytest.mark.parametrize("kind", ["zip", "tar.gz"])
+def test_archive_package_text_reuses_one_open_archive(tmp_path: Path, kind: str) -> None:
+    from windseeker.archive import _archive_reader
+
+    if kind == "zip":
+        archive = _make_zip(tmp_path / "model.zip")
+    else:
+        archive = _make_tar(tmp_path / "model.tar.gz", tmp_path)
+    package_text = scan_folder(str(archive))
+    _archive_reader.cache_clear()
+
+    for _ in range(3):
+        assert package_text["A"] == "package A { import B::*; }"
+        assert package_text["B"] == "package B;"
+
+    info = _archive_reader.cache_info()
+    assert (info.misses, info.currsize) == (1, 1)
+
+
+def test_compressed_tar_reads_out_of_order_without_decompressing_again(
+    tmp_path: Path, monkeypatch
+) -> None:
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(20):
+        (src / f"p{i:02d}.sysml").write_text(f"// header {i}\npackage P{i};\n", encoding="utf-8")
+    archive = tmp_path / "model.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        tf.add(src, arcname="model")
+
+    package_text = scan_folder(str(archive))
+
+    def no_reopen(*args, **kwargs):
+        raise AssertionError("tarball decompressed again")
+
+    monkeypatch.setattr(tarfile, "open", no_reopen)
+    for i in reversed(range(20)):
+        assert package_text[f"P{i}"] == f"package P{i};"
+
+
+def test_plain_tar_reads_package_spans(tmp_path: Path) -> None:
+    archive = _make_tar(tmp_path / "src.tar.gz", tmp_path)
+    plain = tmp_path / "model.tar"
+    with tarfile.open(archive) as src, tarfile.open(plain, "w") as dst:
+        for member in src:
+            dst.addfile(member, src.extractfile(member) if member.isfile() else None)
+
+    package_text = scan_folder(str(plain))
+
+    assert package_text["B"] == "package B;"
+    assert package_text["A"] == "package A { import B::*; }"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import pytest
 from typer.testing import CliRunner
 
 from windseeker.cli import app
@@ -17,6 +18,27 @@ def test_cli_order_prints_packages(monkeypatch) -> None:
     assert "A" in result.stdout
 
 
+def test_cli_rejects_a_folder_that_is_not_an_archive(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr("windseeker.cli.order_only", lambda *a, **k: ["A"])
+    model = tmp_path / "m.sysml"
+    model.write_text("package A;", encoding="utf-8")
+
+    runner = CliRunner()
+    for command in (["order"], ["impact", "A"], ["run", "--no-execute"]):
+        result = runner.invoke(app, [*command, "--folder", str(model)])
+        assert result.exit_code == 2
+        assert "archive" in result.output
+
+
+def test_cli_run_rejects_unknown_engine(monkeypatch) -> None:
+    monkeypatch.setattr("windseeker.cli.run_pipeline", lambda *a, **k: pytest.fail("ran"))
+
+    result = CliRunner().invoke(app, ["run", "--folder", "tests", "--engine", "bogus"])
+
+    assert result.exit_code == 2
+    assert "--engine" in result.output
+
+
 def test_cli_run_prints_summary(monkeypatch) -> None:
     # Import PipelineResult dataclass type from pipeline module
     from windseeker.pipeline import PipelineResult
@@ -32,6 +54,8 @@ def test_cli_run_prints_summary(monkeypatch) -> None:
         views=["A::Views::v1"],
         unresolved_imports={"SysML": {"A"}},
         written_view_files=["views/A.png"],
+        cache_hits=3,
+        cache_misses=1,
     )
 
     monkeypatch.setattr("windseeker.cli.run_pipeline", lambda *a, **k: fake)
@@ -44,3 +68,66 @@ def test_cli_run_prints_summary(monkeypatch) -> None:
     assert "Imports (edges)" in result.stdout
     assert "Views found" in result.stdout
     assert "Unresolved imports" in result.stdout
+    assert "Parse cache: 3 hit(s), 1 miss(es)" in result.stdout
+
+
+def _cumulative_import_us(code: str) -> dict:
+    import subprocess
+    import sys
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                cumulative_us[name.strip()] = int(cumulative)
+    return cumulative_us
+
+
+def test_cli_import_stays_light() -> None:
+    # `windseeker order` must not pay for the graph, notebook, rendering or plotting stack
+    cumulative_us = _cumulative_import_us("import windseeker.cli")
+
+    loaded = {name.split(".")[0] for name in cumulative_us}
+    heavy = {
+        "networkx",
+        "matplotlib",
+        "nbformat",
+        "nbclient",
+        "jupyter_client",
+        "cairosvg",
+        "PIL",
+        "scipy",
+    }
+    assert not loaded & heavy
+    # relative to the same machine: the CLI must cost less than typer plus networkx alone,
+    # which any eager import of the heavy stack (about 1s before lazy imports) exceeds
+    floor_us = _cumulative_import_us("import typer, networkx")
+    assert cumulative_us["windseeker.cli"] < floor_us["typer"] + floor_us["networkx"]
+
+
+def test_cli_order_with_compact_backend_never_imports_networkx(tmp_path) -> None:
+    import subprocess
+    import sys
+
+    (tmp_path / "m.sysml").write_text("package A { import B; }\npackage B;\n", encoding="utf-8")
+    code = (
+        "import sys\n"
+        "from windseeker.cli import app\n"
+        "try:\n"
+        f"    app(['order', '--folder', {str(tmp_path)!r}, '--graph-backend', 'compact', "
+        "'--no-cache'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print('networkx' in sys.modules)\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert "B" in proc.stdout
+    assert proc.stdout.splitlines()[-1] == "False"
@@ -0,0 +1,61 @@
+import pytest
+
+from windseeker.errors import ImportCycleError
+from windseeker.graph import (
+    build_import_graph_from_package_text,
+    find_cycle_components,
+    find_cycles,
+    get_unresolved_imports,
+    reverse_dependencies,
+    topological_packages,
+)
+
+PACKAGE_TEXT = {
+    "A": "package A { import B; import C; }",
+    "B": "package B { import C; import ScalarValues::*; }",
+    "C": "package C;",
+    "D": "package D { import A; }",
+}
+
+
+def test_compact_backend_matches_networkx():
+    G = build_import_graph_from_package_text(PACKAGE_TEXT)
+    C = build_import_graph_from_package_text(PACKAGE_TEXT, backend="compact")
+
+    assert (C.number_of_nodes(), C.number_of_edges()) == (G.number_of_nodes(), G.number_of_edges())
+    assert get_unresolved_imports(C) == get_unresolved_imports(G) == {"ScalarValues": {"B"}}
+    assert set(C.to_networkx().edges) == set(G.edges)
+
+    order = topological_packages(C)
+    for pkg, dep in G.edges:
+        assert order.index(dep) < order.index(pkg)
+    importers_first = topological_packages(C, dependencies_first=False)
+    assert importers_first.index("D") < importers_first.index("A") < importers_first.index("C")
+
+
+def test_compact_reverse_dependencies():
+    C = build_import_graph_from_package_text(PACKAGE_TEXT, backend="compact")
+    G = build_import_graph_from_package_text(PACKAGE_TEXT)
+
+    assert set(reverse_dependencies(C, "C")) == set(reverse_dependencies(G, "C")) == {"A", "B", "D"}
+    assert set(reverse_dependencies(C, "C", transitive=False)) == {"A", "B"}
+
+
+def test_compact_backend_reports_cycles():
+    C = build_import_graph_from_package_text(
+        {"A": "package A { import B; }", "B": "package B { import A; }"}, backend="compact"
+    )
+
+    with pytest.raises(ImportCycleError, match="2 package"):
+        topological_packages(C)
+
+
+def test_compact_backend_cycle_components():
+    C = build_import_graph_from_package_text(
+        {"A": "package A { import B; }", "B": "package B { import A; }", "C": "package C;"},
+        backend="compact",
+    )
+
+    assert [r.members for r in find_cycle_components(C)] == [["A", "B"]]
+    assert find_cycles(C) == [["A", "B"]]
+    assert find_cycles(build_import_graph_from_package_text(PACKAGE_TEXT, backend="compact")) == []
@@ -0,0 +1,31 @@
+import time
+
+import networkx as nx
+import pytest
+
+from windseeker.errors import ImportCycleError
+from windseeker.graph import assert_acyclic_or_raise, find_cycle_components, find_cycles
+
+
+def test_cycle_components_report_size_and_shortest_cycles():
+    G = nx.DiGraph([("A", "B"), ("B", "C"), ("C", "A"), ("B", "A"), ("D", "D"), ("E", "A")])
+
+    reports = find_cycle_components(G)
+
+    assert [r.members for r in reports] == [["A", "B", "C"], ["D"]]
+    assert reports[0].cycles[0] == ["A", "B"]  # shortest cycle through A
+    assert reports[1].cycles == [["D"]]
+    assert ["A", "B"] in find_cycles(G)
+
+
+def test_assert_acyclic_fails_fast_on_densely_cyclic_graph():
+    # a complete digraph on 60 nodes has astronomically many simple cycles
+    G = nx.complete_graph(60, create_using=nx.DiGraph)
+    G = nx.relabel_nodes(G, {i: f"P{i:02d}" for i in G})
+
+    t0 = time.monotonic()
+    with pytest.raises(ImportCycleError) as exc:
+        assert_acyclic_or_raise(G)
+
+    assert time.monotonic() - t0 < 5
+    assert "60 package(s) in a cycle" in str(exc.value)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from windseeker.ignore import ScanRules, walk_sysml_files
+from windseeker.scan import scan_folder
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_default_rules_prune_tool_directories(tmp_path: Path) -> None:
+    _write(tmp_path / "model" / "a.sysml", "package A;")
+    _write(tmp_path / ".git" / "x.sysml", "package Git;")
+    _write(tmp_path / "node_modules" / "pkg" / "y.sysml", "package Npm;")
+
+    found = list(walk_sysml_files(tmp_path, ScanRules.for_root(tmp_path)))
+
+    assert found == [tmp_path / "model" / "a.sysml"]
+
+
+def test_excluded_directories_are_never_entered(tmp_path: Path, monkeypatch) -> None:
+    _write(tmp_path / "a.sysml", "package A;")
+    _write(tmp_path / "vendor" / "lib" / "b.sysml", "package B;")
+
+    opened = []
+    real_scandir = os.scandir
+
+    def spy(path):
+        opened.append(Path(path).name)
+        return real_scandir(path)
+
+    monkeypatch.setattr("windseeker.ignore.os.scandir", spy)
+    rules = ScanRules.for_root(tmp_path, exclude=["vendor/"])
+
+    assert [p.name for p in walk_sysml_files(tmp_path, rules)] == ["a.sysml"]
+    assert "vendor" not in opened and "lib" not in opened
+
+
+def test_scan_folder_honors_ignore_file_and_include(tmp_path: Path) -> None:
+    _write(tmp_path / ".windseekerignore", "# generated output\nbuild\nmodels/old/*\n")
+    _write(tmp_path / "models" / "a.sysml", "package A;")
+    _write(tmp_path / "models" / "a_test.sysml", "package ATest;")
+    _write(tmp_path / "models" / "old" / "b.sysml", "package Old;")
+    _write(tmp_path / "build" / "c.sysml", "package Built;")
+
+    assert set(scan_folder(str(tmp_path))) == {"A", "ATest"}
+    assert set(scan_folder(str(tmp_path), exclude=["*_test.sysml"])) == {"A"}
+    assert set(scan_folder(str(tmp_path), include=["models/a*"])) == {"A", "ATest"}
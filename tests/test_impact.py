@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import networkx as nx
+from typer.testing import CliRunner
+
+from windseeker.cli import app
+from windseeker.graph import build_import_graph_from_package_text
+from windseeker.impact import ReachabilityIndex
+
+
+def test_reachability_index_matches_ancestors_on_both_backends():
+    G = nx.gnp_random_graph(60, 0.08, seed=3, directed=True)
+    G = nx.DiGraph((f"P{u}", f"P{v}") for u, v in G.edges if u > v)  # acyclic
+    text = {n: f"package {n} {{ {' '.join(f'import {d};' for d in G.successors(n))} }}" for n in G}
+
+    for backend in ("networkx", "compact"):
+        index = ReachabilityIndex(build_import_graph_from_package_text(text, backend=backend))
+        for n in G:
+            assert set(index.affected_packages([n])) == nx.ancestors(G, n) | {n}
+
+    index = ReachabilityIndex(G)
+    affected = index.affected_packages(["P3"])
+    for pkg, dep in G.subgraph(affected).edges:
+        assert affected.index(dep) < affected.index(pkg)
+
+
+def test_cli_impact_lists_affected_packages_and_views(tmp_path: Path) -> None:
+    (tmp_path / "base.sysml").write_text("package Base;\n", encoding="utf-8")
+    (tmp_path / "mid.sysml").write_text(
+        "package Mid { import Base::*; view MidView { } }\n", encoding="utf-8"
+    )
+    (tmp_path / "top.sysml").write_text(
+        "package Top { import Mid::*; package V { view TopView { } } }\npackage Other;\n",
+        encoding="utf-8",
+    )
+
+    runner = CliRunner()
+    args = ["impact", "--folder", str(tmp_path), "--no-cache"]
+    result = runner.invoke(app, args + [str(tmp_path / "base.sysml")])
+
+    assert result.exit_code == 0, result.stdout
+    assert "Changed: Base" in result.stdout
+    assert "Affected packages: 3" in result.stdout
+    assert "Mid::MidView" in result.stdout
+    assert "Top::V::TopView" in result.stdout
+    assert "Other" not in result.stdout
+
+    result = runner.invoke(app, args + ["Nope"])
+    assert result.exit_code != 0
+
+
+def test_impact_reuses_the_saved_index_until_imports_change(tmp_path: Path, monkeypatch) -> None:
+    import windseeker.pipeline as pipeline
+
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "base.sysml").write_text("package Base;\n", encoding="utf-8")
+    (model / "top.sysml").write_text("package Top { import Base::*; }\n", encoding="utf-8")
+    (model / "other.sysml").write_text("package Other;\n", encoding="utf-8")
+    cache_dir = str(tmp_path / "cache")
+    builds = []
+    real_build = pipeline.build_import_graph_from_package_text
+
+    def counting_build(*args, **kwargs):
+        builds.append(1)
+        return real_build(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline, "build_import_graph_from_package_text", counting_build)
+
+    def affected() -> list:
+        return pipeline.impact(folder=str(model), targets=["Base"], cache_dir=cache_dir).packages
+
+    assert affected() == ["Base", "Top"]
+    assert affected() == ["Base", "Top"]
+    assert len(builds) == 1
+
+    (model / "other.sysml").write_text("package Other { import Top::*; }\n", encoding="utf-8")
+    assert affected() == ["Base", "Top", "Other"]
+    assert len(builds) == 2
@@ -1,4 +1,5 @@
 from windseeker.graph import build_import_graph_from_package_text
+from windseeker.scan import iter_packages
 
 
 def test_build_import_graph():
@@ -11,3 +12,15 @@ def test_build_import_graph():
 
     assert set(G.nodes) == {"A", "B"}
     assert ("A", "B") in G.edges
+
+
+def test_build_import_graph_from_record_stream(tmp_path):
+    (tmp_path / "m.sysml").write_text(
+        "package A { import B; import X; }\npackage B;\npackage A { import C; }\n",
+        encoding="utf-8",
+    )
+
+    G = build_import_graph_from_package_text(iter_packages(str(tmp_path)))
+
+    assert set(G.edges) == {("A", "B"), ("A", "X")}  # first definition of A wins
+    assert G.graph["unresolved_imports"] == {"X": {"A"}}
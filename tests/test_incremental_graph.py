@@ -0,0 +1,81 @@
+import random
+
+import networkx as nx
+import pytest
+
+from windseeker.errors import ImportCycleError
+from windseeker.graph import build_import_graph_from_package_text
+from windseeker.incremental import IncrementalImportGraph
+
+
+def _assert_valid_order(inc: IncrementalImportGraph) -> None:
+    order = inc.topological_order()
+    assert sorted(order) == sorted(inc.graph.nodes)
+    pos = {n: i for i, n in enumerate(order)}
+    for pkg, dep in inc.graph.edges:
+        assert pos[dep] < pos[pkg]
+
+
+def test_incremental_updates_keep_order_and_unresolved_current():
+    inc = IncrementalImportGraph.from_packages(
+        {"A": "package A { import B; }", "B": "package B;", "C": "package C { import X; }"}
+    )
+    assert inc.unresolved_imports() == {"X": {"C"}}
+
+    inc.set_package("B", ["C"])  # B now depends on C, which was placed after B
+    _assert_valid_order(inc)
+
+    inc.set_package("X", [])
+    assert inc.unresolved_imports() == {}
+
+    inc.remove_package("C")
+    assert inc.unresolved_imports() == {"C": {"B"}}
+    assert "X" in inc.graph  # still defined
+
+    inc.set_package("B", [])
+    assert "C" not in inc.graph  # no longer imported by anyone
+    _assert_valid_order(inc)
+
+
+def test_incremental_cycle_is_rejected_and_rolled_back():
+    inc = IncrementalImportGraph.from_packages(
+        {"A": "package A { import B; }", "B": "package B { import C; }", "C": "package C;"}
+    )
+    before = set(inc.graph.edges)
+
+    with pytest.raises(ImportCycleError, match="C -> A -> B -> C"):
+        inc.set_package("C", ["A"])
+
+    assert set(inc.graph.edges) == before
+    _assert_valid_order(inc)
+
+
+def test_incremental_matches_full_rebuild_under_random_edits():
+    rng = random.Random(7)
+    names = [f"P{i}" for i in range(40)]
+    inc = IncrementalImportGraph()
+    current: dict[str, list[str]] = {}
+
+    for _ in range(400):
+        name = rng.choice(names)
+        if rng.random() < 0.15:
+            inc.remove_package(name)
+            current.pop(name, None)
+            continue
+        imports = rng.sample(names, rng.randrange(3))
+        try:
+            inc.set_package(name, imports)
+        except ImportCycleError:
+            continue
+        current[name] = [i for i in imports if i != name]
+
+    text = {
+        n: f"package {n} {{ {' '.join(f'import {i};' for i in deps)} }}"
+        for n, deps in current.items()
+    }
+    G = build_import_graph_from_package_text(text)
+    assert set(inc.graph.edges) == set(G.edges)
+    assert set(inc.graph.nodes) == set(G.nodes)
+    assert inc.unresolved_imports() == G.graph["unresolved_imports"]
+    assert nx.is_directed_acyclic_graph(inc.graph)
+    _assert_valid_order(inc)
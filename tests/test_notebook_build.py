@@ -53,3 +53,110 @@ def test_write_notebook_includes_view_cells(tmp_path: Path) -> None:
     assert "A::Views::v1" in "".join(cells[1]["source"])
     assert cells[2]["cell_type"] == "code"
     assert "".join(cells[2]["source"]).lstrip().startswith("%view A::Views::v1")
+
+
+def test_streamed_notebook_matches_json_dumps_layout(tmp_path: Path) -> None:
+    G = nx.DiGraph([("A", "B")])
+    package_text = {"A": "package A {\n  import B::*;\n}\n", "B": 'package B { doc "é"; }\n'}
+
+    indented = tmp_path / "indented.ipynb"
+    compact = tmp_path / "compact.ipynb"
+    write_notebook_in_dependency_order(G, package_text, views=["A::v"], out_path=str(indented))
+    write_notebook_in_dependency_order(
+        G, package_text, views=["A::v"], out_path=str(compact), indent=None
+    )
+
+    text = indented.read_text(encoding="utf-8")
+    nb = json.loads(text)
+    assert text == json.dumps(nb, indent=2)
+    compact_nb = json.loads(compact.read_text(encoding="utf-8"))
+    assert "\n" not in compact.read_text(encoding="utf-8")
+    for cell in nb["cells"] + compact_nb["cells"]:
+        del cell["id"]  # random per write
+    assert compact_nb == nb
+
+
+def test_streamed_notebook_without_cells_is_valid(tmp_path: Path) -> None:
+    out = tmp_path / "empty.ipynb"
+    for indent in (2, None):
+        write_notebook_in_dependency_order(nx.DiGraph(), {}, out_path=str(out), indent=indent)
+        assert json.loads(out.read_text(encoding="utf-8"))["cells"] == []
+
+
+def _cells_by_name(G, package_text, tmp_path: Path) -> dict:
+    out = tmp_path / "nb.ipynb"
+    write_notebook_in_dependency_order(G, package_text, views=["A::v"], out_path=str(out))
+    cells = json.loads(out.read_text(encoding="utf-8"))["cells"]
+    return {
+        (c["metadata"]["windseeker"]["kind"], c["metadata"]["windseeker"]["name"]): c for c in cells
+    }
+
+
+def test_cell_ids_and_content_hashes_are_deterministic(tmp_path: Path) -> None:
+    import re
+
+    # A imports B; C is unrelated
+    G = nx.DiGraph([("A", "B")])
+    G.add_node("C")
+    text = {"A": "package A;\n", "B": "package B;\n", "C": "package C;\n"}
+
+    first = _cells_by_name(G, text, tmp_path)
+    assert first == _cells_by_name(G, dict(text), tmp_path)
+    ids = [c["id"] for c in first.values()]
+    assert len(set(ids)) == len(ids)
+    assert all(re.fullmatch(r"[a-zA-Z0-9_-]{1,64}", i) for i in ids)
+
+    unrelated = _cells_by_name(G, {**text, "C": "package C { part x; }\n"}, tmp_path)
+    assert unrelated[("view", "A::v")] == first[("view", "A::v")]
+    assert unrelated[("package", "C")]["id"] != first[("package", "C")]["id"]
+
+    # changing a dependency of the view's package changes the view cell, not A's cell
+    dep_changed = _cells_by_name(G, {**text, "B": "package B { part y; }\n"}, tmp_path)
+    view_key = ("view", "A::v")
+    assert dep_changed[view_key]["metadata"] != first[view_key]["metadata"]
+    assert dep_changed[view_key]["id"] != first[view_key]["id"]
+    assert dep_changed[("package", "A")] == first[("package", "A")]
+
+
+def test_cell_batching_parse() -> None:
+    import pytest
+
+    from windseeker.notebook.build import CellBatching
+
+    assert CellBatching.parse("none") == CellBatching()
+    assert CellBatching.parse("25") == CellBatching("count", 25)
+    assert CellBatching.parse("bytes:64k") == CellBatching("bytes", 64 * 1024)
+    assert CellBatching.parse("Generation") == CellBatching("generation")
+    for bad in ("count:0", "lines:3", "bytes:", "fast"):
+        with pytest.raises(ValueError):
+            CellBatching.parse(bad)
+
+
+def test_batched_cells_keep_dependency_order_and_package_line_ranges(tmp_path: Path) -> None:
+    from windseeker.notebook.build import CellBatching
+
+    # C imports B imports A; D is independent
+    G = nx.DiGraph([("C", "B"), ("B", "A")])
+    G.add_node("D")
+    text = {p: f"package {p} {{\n  part x;\n}}\n" for p in "ABCD"}
+    out = tmp_path / "nb.ipynb"
+
+    for batching, sizes in (
+        (CellBatching("count", 3), [3, 1]),
+        (CellBatching("bytes", 2 * len(text["A"])), [2, 2]),
+        (CellBatching("generation"), [2, 1, 1]),
+    ):
+        write_notebook_in_dependency_order(G, text, out_path=str(out), batching=batching)
+        cells = json.loads(out.read_text(encoding="utf-8"))["cells"]
+
+        seen = []
+        for cell in cells:
+            meta = cell["metadata"]["windseeker"]
+            members = meta.get("packages") or [{"name": meta["name"], "first_line": 1}]
+            for m in members:
+                start = m["first_line"] - 1
+                assert cell["source"][start] == f"package {m['name']} {{\n"
+                seen.append(m["name"])
+        assert [len(c["metadata"]["windseeker"].get("packages") or [1]) for c in cells] == sizes
+        assert sorted(seen) == list("ABCD")
+        assert seen.index("A") < seen.index("B") < seen.index("C")
@@ -76,3 +76,25 @@ def test_format_notebook_issues_includes_view_prefix() -> None:
     msg = format_notebook_issues(issues)
     assert "VIEW A::B::v1" in msg
     assert "Cell 3" in msg
+
+
+def test_batched_cell_issues_are_attributed_by_line() -> None:
+    nb = _nb_with_one_cell(
+        "package A;\npackage B {\n  part x : Missing;\n}\n",
+        stderr_text="ERROR:Couldn't resolve reference to Missing (1.sysml line : 3 column : 12)",
+    )
+    nb.cells[0].metadata["windseeker"] = {
+        "kind": "package_batch",
+        "name": "A..B",
+        "packages": [
+            {"name": "A", "first_line": 1, "line_count": 1},
+            {"name": "B", "first_line": 2, "line_count": 3},
+        ],
+    }
+
+    issues = collect_notebook_issues(nb)
+    assert issues[0]["packages"] == ["B"]
+    assert "[PACKAGE B]" in format_notebook_issues(issues)
+
+    nb.cells[0].outputs[0]["text"] = "ERROR: something without a position"
+    assert collect_notebook_issues(nb)[0]["packages"] == ["A", "B"]
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from windseeker.notebook.kernel import KernelSession
+from windseeker.pipeline import run_pipeline
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"></svg>'
+
+
+class _FakeClient:
+    def __init__(self, iopub, reply_count=1) -> None:
+        self.iopub = list(iopub)
+        self.shell = [
+            {"parent_header": {"msg_id": "other"}, "content": {}},
+            {"parent_header": {"msg_id": "m1"}, "content": {"execution_count": reply_count}},
+        ]
+
+    def execute(self, source, **kwargs) -> str:
+        self.source = source
+        return "m1"
+
+    def get_iopub_msg(self, timeout):
+        return self.iopub.pop(0)
+
+    def get_shell_msg(self, timeout):
+        return self.shell.pop(0)
+
+
+def _msg(msg_type: str, content: dict, parent: str = "m1") -> dict:
+    return {
+        "msg_type": msg_type,
+        "parent_header": {"msg_id": parent},
+        "header": {"msg_type": msg_type},
+        "content": content,
+    }
+
+
+def _session(client) -> KernelSession:
+    session = object.__new__(KernelSession)
+    session.kernel_name, session.timeout_sec, session.kc = "sysml", 5, client
+    return session
+
+
+def test_kernel_session_collects_outputs_of_its_own_request() -> None:
+    client = _FakeClient(
+        [
+            _msg("status", {"execution_state": "busy"}),
+            _msg("stream", {"name": "stdout", "text": "stale"}, parent="other"),
+            _msg("stream", {"name": "stdout", "text": "discarded"}),
+            _msg("clear_output", {"wait": False}),
+            _msg("stream", {"name": "stderr", "text": "ERROR: bad"}),
+            _msg("display_data", {"data": {"image/svg+xml": SVG}, "metadata": {}}),
+            _msg("status", {"execution_state": "idle"}),
+        ],
+        reply_count=7,
+    )
+    cell = {"cell_type": "code", "source": ["%view ", "A::v\n"], "outputs": []}
+
+    _session(client).run_cell(cell)
+
+    assert client.source == "%view A::v\n"
+    assert cell["execution_count"] == 7
+    assert [o["output_type"] for o in cell["outputs"]] == ["stream", "display_data"]
+    assert cell["outputs"][1]["data"]["image/svg+xml"] == SVG
+
+
+def test_kernel_session_times_out() -> None:
+    import queue
+
+    class Silent(_FakeClient):
+        def get_iopub_msg(self, timeout):
+            raise queue.Empty
+
+    with pytest.raises(TimeoutError):
+        _session(Silent([])).execute("package A;")
+
+
+class _FakeKernelSession:
+    instances = 0
+
+    def __init__(self, kernel_name: str, **kwargs) -> None:
+        _FakeKernelSession.instances += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def run_cell(self, cell: dict) -> dict:
+        if cell["metadata"]["windseeker"]["kind"] == "view":
+            cell["outputs"] = [
+                {"output_type": "display_data", "data": {"image/svg+xml": SVG}, "metadata": {}}
+            ]
+        return cell
+
+
+def test_kernel_engine_runs_without_notebook_files(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("windseeker.notebook.kernel.KernelSession", _FakeKernelSession)
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "m.sysml").write_text(
+        "package Base;\npackage Top { import Base::*; view V { } }\n", encoding="utf-8"
+    )
+
+    result = run_pipeline(
+        folder=str(model),
+        write_graph=False,
+        engine="kernel",
+        notebook_artifacts=False,
+        sysml_out=str(tmp_path / "out.sysml"),
+        notebook_out=str(tmp_path / "out.ipynb"),
+        executed_notebook_out=str(tmp_path / "executed.ipynb"),
+        views_dir=str(tmp_path / "views"),
+        write_png=False,
+    )
+
+    assert _FakeKernelSession.instances == 1
+    assert [Path(p).name for p in result.written_view_files] == ["Top__V.svg"]
+    assert not (tmp_path / "out.ipynb").exists()
+    assert not (tmp_path / "executed.ipynb").exists()
+
+
+def test_run_pipeline_rejects_unknown_engine(tmp_path: Path) -> None:
+    (tmp_path / "m.sysml").write_text("package A;\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        run_pipeline(
+            folder=str(tmp_path),
+            write_graph=False,
+            engine="nope",
+            sysml_out=str(tmp_path / "out.sysml"),
+        )
+
+
+class _StatefulKernel:
+    """Fake SysML kernel: a view renders only if its owner and all imports were loaded."""
+
+    sessions: list = []
+
+    def __init__(self, kernel_name: str, **kwargs) -> None:
+        self.loaded: list = []
+        _StatefulKernel.sessions.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def run_cell(self, cell: dict) -> dict:
+        import re
+
+        src = "".join(cell["source"])
+        if src.startswith("%view"):
+            view = src.split(None, 1)[1].strip()
+            owner = view.split("::", 1)[0]
+            ok = owner in self.loaded and all(d in self.loaded for d in _DEPS.get(owner, ()))
+            data = {"image/svg+xml": SVG.replace("<svg ", f'<svg id="{view}" ')} if ok else {}
+            cell["outputs"] = [{"output_type": "display_data", "data": data, "metadata": {}}]
+        else:
+            for name in re.findall(r"^package (\w+)", src, re.M):
+                assert all(d in self.loaded for d in _DEPS.get(name, ())), "deps loaded first"
+                self.loaded.append(name)
+            cell["outputs"] = []
+        return cell
+
+
+_DEPS = {"P1": ["Base"], "P2": ["Base", "Mid"], "Mid": ["Base"]}
+
+
+def test_kernel_pool_loads_only_needed_packages_and_keeps_view_order(monkeypatch) -> None:
+    import networkx as nx
+
+    from windseeker.notebook.build import CellBatching
+    from windseeker.notebook.pool import execute_in_kernel_pool
+
+    G = nx.DiGraph([("P1", "Base"), ("P2", "Mid"), ("Mid", "Base")])
+    G.add_node("Lonely")
+    text = {p: f"package {p};\n" for p in ("Base", "Mid", "P1", "P2", "Lonely")}
+    views = [f"P{i % 2 + 1}::v{i}" for i in range(8)]
+    monkeypatch.setattr("windseeker.notebook.pool.KernelSession", _StatefulKernel)
+
+    for batching in (None, CellBatching("count", 2)):
+        _StatefulKernel.sessions = []
+        executed = execute_in_kernel_pool(G, text, views, kernels=3, batching=batching)
+
+        view_cells = [c for c in executed if c["metadata"]["windseeker"]["kind"] == "view"]
+        assert [c["metadata"]["windseeker"]["name"] for c in view_cells] == views
+        for cell in view_cells:
+            name = cell["metadata"]["windseeker"]["name"]
+            assert f'id="{name}"' in cell["outputs"][0]["data"]["image/svg+xml"]
+
+        assert 1 <= len(_StatefulKernel.sessions) <= 3
+        for kernel in _StatefulKernel.sessions:
+            assert len(kernel.loaded) == len(set(kernel.loaded))  # nothing loaded twice
+        loaded = {p for k in _StatefulKernel.sessions for p in k.loaded}
+        assert loaded == set(text)  # Lonely is compiled too, for error reporting
+
+        package_cells = [c for c in executed if c["metadata"]["windseeker"]["kind"] != "view"]
+        ids = [c["id"] for c in package_cells if c["cell_type"] == "code"]
+        assert len(ids) == len(set(ids))
+
+
+def test_run_pipeline_kernels_require_kernel_engine(tmp_path: Path) -> None:
+    (tmp_path / "m.sysml").write_text("package A;\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        run_pipeline(
+            folder=str(tmp_path),
+            write_graph=False,
+            kernels=2,
+            sysml_out=str(tmp_path / "out.sysml"),
+        )
+
+
+def test_kernel_pool_merges_shared_packages_once_with_batching(monkeypatch) -> None:
+    import re
+    import threading
+
+    import networkx as nx
+
+    from windseeker.notebook.build import CellBatching
+    from windseeker.notebook.pool import execute_in_kernel_pool
+
+    both_started = threading.Barrier(2, timeout=10)
+
+    class BothKernels(_StatefulKernel):
+        def __init__(self, kernel_name: str, **kwargs) -> None:
+            super().__init__(kernel_name, **kwargs)
+            both_started.wait()  # make sure each kernel takes one of the two views
+
+    monkeypatch.setattr("windseeker.notebook.pool.KernelSession", BothKernels)
+    monkeypatch.setitem(_DEPS, "A", ["Base"])
+    monkeypatch.setitem(_DEPS, "B", ["Base"])
+    _StatefulKernel.sessions = []
+    G = nx.DiGraph([("A", "Base"), ("B", "Base")])
+    text = {p: f"package {p};\n" for p in ("Base", "A", "B")}
+
+    executed = execute_in_kernel_pool(
+        G, text, ["A::v", "B::v"], kernels=2, batching=CellBatching("count", 5)
+    )
+
+    assert len(_StatefulKernel.sessions) == 2
+    assert all("Base" in k.loaded for k in _StatefulKernel.sessions)
+    package_cells = [c for c in executed if c["metadata"]["windseeker"]["kind"] != "view"]
+    package_cells = [c for c in package_cells if c["cell_type"] == "code"]
+    merged = [
+        n for c in package_cells for n in re.findall(r"^package (\w+)", "".join(c["source"]), re.M)
+    ]
+    assert sorted(merged) == ["A", "B", "Base"]  # every package exactly once
+    assert merged[0] == "Base"
+
+
+def test_kernel_pool_package_cells_match_the_single_kernel_notebook(monkeypatch) -> None:
+    import networkx as nx
+
+    from windseeker.graph import topological_packages
+    from windseeker.notebook.build import CellBatching, iter_package_cells
+    from windseeker.notebook.pool import execute_in_kernel_pool
+
+    G = nx.DiGraph([("P1", "Base"), ("P2", "Mid"), ("Mid", "Base")])
+    G.add_node("Lonely")
+    text = {p: f"package {p};\n" for p in ("Base", "Mid", "P1", "P2", "Lonely")}
+    views = [f"P{i % 2 + 1}::v{i}" for i in range(8)]
+    monkeypatch.setattr("windseeker.notebook.pool.KernelSession", _StatefulKernel)
+
+    for batching in (None, CellBatching("count", 2), CellBatching("generation")):
+        expected = list(iter_package_cells(G, topological_packages(G), text, batching=batching))
+        for kernels in (1, 2, 3):
+            executed = execute_in_kernel_pool(G, text, views, kernels=kernels, batching=batching)
+            package_cells = executed[: len(expected)]
+            assert [c["id"] for c in package_cells] == [c["id"] for c in expected]
+            assert [c["source"] for c in package_cells] == [c["source"] for c in expected]
+            assert all(c["metadata"] == e["metadata"] for c, e in zip(package_cells, expected))
+            assert len(executed) == len(expected) + 2 * len(views)
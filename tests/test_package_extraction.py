@@ -14,3 +14,69 @@ def test_extract_simple_packages():
     assert "package A;" in pkgs["A"]
     assert "package B" in pkgs["B"]
     assert "library package C" in pkgs["C"]
+
+
+def test_extract_skips_block_comments_and_quoted_names():
+    text = """
+    /* package Hidden { } */
+    package 'My Pkg' {
+        part p { doc /* } package Nope; */ }
+    }
+    package Next; // package Fake;
+    """
+
+    pkgs = dict(extract_top_level_packages_with_text(text))
+
+    assert set(pkgs.keys()) == {"My Pkg", "Next"}
+    assert pkgs["My Pkg"].rstrip().endswith("}")
+    assert pkgs["Next"] == "package Next;"
+
+
+def test_parse_sysml_single_pass_outline():
+    from windseeker.parsing import parse_sysml
+
+    text = (
+        "package A { private import B::C::*; public import all 'D e'::**; "
+        "package In { view V { } } } package B { import A; }"
+    )
+
+    outline = parse_sysml(text)
+
+    assert [p.name for p in outline.packages] == ["A", "B"]
+    a, b = outline.packages
+    assert a.imports == ["B::C", "D e"]
+    assert a.views == ["In::V"]
+    assert a.qualified_views() == ["A::In::V"]
+    assert b.top_level_imports() == ["A"]
+    assert text[b.start : b.end] == "package B { import A; }"
+
+
+def test_parse_sysml_bytes_matches_str_with_utf8_names():
+    from windseeker.parsing import parse_sysml
+
+    text = "package Größe { import Maße::*; package Ä { view Ü { } } }\npackage B;\n"
+    data = text.encode("utf-8")
+
+    from_str = parse_sysml(text)
+    from_bytes = parse_sysml(data)
+
+    assert [p.name for p in from_bytes.packages] == ["Größe", "B"]
+    assert [(p.imports, p.views) for p in from_bytes.packages] == [
+        (p.imports, p.views) for p in from_str.packages
+    ]
+    # spans are byte offsets for bytes input
+    first = from_bytes.packages[0]
+    assert data[first.start : first.end].decode("utf-8") == text.splitlines()[0]
+
+
+def test_parse_sysml_statement_after_doc_or_comment_annotation():
+    from windseeker.parsing import parse_sysml
+
+    text = (
+        "package A { package Views { doc /* Views for A */ view tree { } } "
+        "comment c1 about tree /* note */ view other { } }"
+    )
+
+    for source in (text, text.encode("utf-8")):
+        (a,) = parse_sysml(source).packages
+        assert a.views == ["Views::tree", "other"]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from windseeker.cache import ParseCache
+from windseeker.graph import build_import_graph_from_package_text
+from windseeker.parsing import collect_all_views
+from windseeker.scan import scan_folder
+
+
+def _write_model(root: Path) -> None:
+    (root / "a.sysml").write_text(
+        "package A {\n  private import B::*;\n  view V {\n  }\n}\n", encoding="utf-8"
+    )
+    (root / "b.sysml").write_text("package B;\n", encoding="utf-8")
+
+
+def test_parse_cache_hits_for_unchanged_files(tmp_path: Path) -> None:
+    models = tmp_path / "models"
+    models.mkdir()
+    _write_model(models)
+    cache_dir = tmp_path / "cache"
+
+    first = ParseCache(str(cache_dir))
+    scan_folder(str(models), cache=first)
+    assert (first.hits, first.misses) == (0, 2)
+    assert (cache_dir / "parse-cache.json").exists()
+
+    second = ParseCache(str(cache_dir))
+    package_text = scan_folder(str(models), cache=second)
+    assert (second.hits, second.misses) == (2, 0)
+
+    # Cached imports/views feed graph building and view collection
+    G = build_import_graph_from_package_text(package_text)
+    assert ("A", "B") in G.edges
+    assert collect_all_views(package_text) == ["A::V"]
+
+
+def test_parse_cache_misses_only_modified_files(tmp_path: Path) -> None:
+    _write_model(tmp_path)
+    cache_dir = tmp_path / ".cache"
+    scan_folder(str(tmp_path), cache=ParseCache(str(cache_dir)))
+
+    (tmp_path / "b.sysml").write_text("package B { private import C::*; }\n", encoding="utf-8")
+
+    cache = ParseCache(str(cache_dir))
+    package_text = scan_folder(str(tmp_path), cache=cache)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert "import C" in package_text["B"]
+
+
+def test_parse_cache_falls_back_to_content_hash_when_mtime_changes(tmp_path: Path) -> None:
+    _write_model(tmp_path)
+    cache_dir = tmp_path / ".cache"
+    scan_folder(str(tmp_path), cache=ParseCache(str(cache_dir)))
+
+    a = tmp_path / "a.sysml"
+    st = a.stat()
+    os.utime(a, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+    cache = ParseCache(str(cache_dir))
+    scan_folder(str(tmp_path), cache=cache)
+
+    assert (cache.hits, cache.misses) == (2, 0)
@@ -65,3 +65,18 @@ def test_collect_all_views_across_packages_and_dedups() -> None:
     assert "B::V" in views
     assert "A_dup::V" in views
     assert len(views) == len(set(views))
+
+
+def test_parse_imports_ignores_comments_and_strings() -> None:
+    from windseeker.parsing import parse_imports_from_package_text
+
+    pkg_text = """
+package Top {
+  /* Changed import to private import
+     private import Hidden::*; */
+  doc /* import AlsoHidden; */
+  attribute s : String = "import NotAnImport;";
+  private import Real::Nested::*; private import Top::Self;
+}
+"""
+    assert parse_imports_from_package_text("Top", pkg_text) == ["Real"]
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import networkx as nx
+import pytest
 
 from windseeker.pipeline import run_pipeline
 
@@ -16,7 +17,7 @@ def test_run_pipeline_execute_false_skips_execute_and_extract(tmp_path: Path, mo
     G.add_node("A")
 
     # Patch pipeline dependencies (patch names as imported in windseeker.pipeline)
-    monkeypatch.setattr("windseeker.pipeline.scan_folder", lambda folder: fake_package_text)
+    monkeypatch.setattr("windseeker.pipeline.scan_folder", lambda folder, **k: fake_package_text)
     monkeypatch.setattr("windseeker.pipeline.build_import_graph_from_package_text", lambda pt: G)
     monkeypatch.setattr("windseeker.pipeline.assert_acyclic_or_raise", lambda g: None)
     monkeypatch.setattr(
@@ -24,7 +25,7 @@ def test_run_pipeline_execute_false_skips_execute_and_extract(tmp_path: Path, mo
     )
     monkeypatch.setattr("windseeker.pipeline.get_unresolved_imports", lambda *a, **k: {})
     monkeypatch.setattr("windseeker.pipeline.collect_all_views", lambda pt: ["A::Views::v1"])
-    monkeypatch.setattr("windseeker.pipeline.visualize_graph_to_file", lambda *a, **k: None)
+    monkeypatch.setattr("windseeker.visualize.visualize_graph_to_file", lambda *a, **k: None)
     monkeypatch.setattr("windseeker.pipeline.topological_packages", lambda *a, **k: ["A"])
 
     # Let sysml writer happen as real (writes to tmp_path)
@@ -65,7 +66,7 @@ def test_run_pipeline_export_views_false_skips_extract(tmp_path: Path, monkeypat
     G = nx.DiGraph()
     G.add_node("A")
 
-    monkeypatch.setattr("windseeker.pipeline.scan_folder", lambda folder: fake_package_text)
+    monkeypatch.setattr("windseeker.pipeline.scan_folder", lambda folder, **k: fake_package_text)
     monkeypatch.setattr("windseeker.pipeline.build_import_graph_from_package_text", lambda pt: G)
     monkeypatch.setattr("windseeker.pipeline.assert_acyclic_or_raise", lambda g: None)
     monkeypatch.setattr(
@@ -73,7 +74,7 @@ def test_run_pipeline_export_views_false_skips_extract(tmp_path: Path, monkeypat
     )
     monkeypatch.setattr("windseeker.pipeline.get_unresolved_imports", lambda *a, **k: {})
     monkeypatch.setattr("windseeker.pipeline.collect_all_views", lambda pt: [])
-    monkeypatch.setattr("windseeker.pipeline.visualize_graph_to_file", lambda *a, **k: None)
+    monkeypatch.setattr("windseeker.visualize.visualize_graph_to_file", lambda *a, **k: None)
     monkeypatch.setattr("windseeker.pipeline.topological_packages", lambda *a, **k: ["A"])
     monkeypatch.setattr(
         "windseeker.pipeline.write_notebook_in_dependency_order",
@@ -101,3 +102,88 @@ def test_run_pipeline_export_views_false_skips_extract(tmp_path: Path, monkeypat
     assert called["execute"] == 1
     assert called["extract"] == 0
     assert result.written_view_files == []
+
+
+def test_run_pipeline_view_selection_slices_notebook(tmp_path: Path) -> None:
+    import json
+
+    model = tmp_path / "model"
+    model.mkdir()
+    (model / "m.sysml").write_text(
+        "package Base;\n"
+        "package Mid { import Base::*; import ScalarValues::*; view MidView { } }\n"
+        "package Other { view OtherView { } }\n"
+        "package Top { import Mid::*; package Vs { view TopView { } } }\n",
+        encoding="utf-8",
+    )
+    nb_out = tmp_path / "out.ipynb"
+
+    result = run_pipeline(
+        folder=str(model),
+        write_graph=False,
+        execute=False,
+        sysml_out=str(tmp_path / "out.sysml"),
+        notebook_out=str(nb_out),
+        view_globs=["Mid::*"],
+    )
+
+    cells = json.loads(nb_out.read_text(encoding="utf-8"))["cells"]
+    names = [
+        (c["metadata"]["windseeker"]["kind"], c["metadata"]["windseeker"]["name"]) for c in cells
+    ]
+    assert names == [
+        ("package", "Base"),
+        ("package", "Mid"),
+        ("view_title", "Mid::MidView"),
+        ("view", "Mid::MidView"),
+    ]
+    assert result.views == ["Mid::MidView"]
+    assert result.notebook_packages == ["Base", "Mid"]
+
+    with pytest.raises(ValueError, match="Unknown view"):
+        run_pipeline(
+            folder=str(model),
+            write_graph=False,
+            execute=False,
+            sysml_out=str(tmp_path / "out.sysml"),
+            notebook_out=str(nb_out),
+            view_names=["Nope::V"],
+        )
+
+
+def test_sysml_concatenation_is_written_in_dependency_order(tmp_path) -> None:
+    from windseeker.pipeline import _write_sysml_in_dependency_order
+
+    G = nx.DiGraph([("A", "B")])
+    out = tmp_path / "out.sysml"
+
+    _write_sysml_in_dependency_order(
+        G, {"A": "package A;\n\n", "B": "package B;"}, out_path=str(out)
+    )
+
+    assert out.read_text(encoding="utf-8") == (
+        "// ===== PACKAGE: B =====\npackage B;\n\n// ===== PACKAGE: A =====\npackage A;\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [({"engine": "bogus"}, "Unknown execution engine"), ({"kernels": 2}, "kernels > 1")],
+)
+def test_run_pipeline_rejects_bad_engine_options_before_writing(
+    tmp_path: Path, options: dict, message: str
+) -> None:
+    (tmp_path / "m.sysml").write_text("package A;\n", encoding="utf-8")
+    sysml_out = tmp_path / "out.sysml"
+
+    with pytest.raises(ValueError, match=message):
+        run_pipeline(
+            folder=str(tmp_path),
+            write_graph=False,
+            execute=False,
+            sysml_out=str(sysml_out),
+            notebook_out=str(tmp_path / "out.ipynb"),
+            **options,
+        )
+
+    assert not sysml_out.exists()
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from windseeker.scan import scan_folder
+from windseeker.scan import iter_packages, scan_folder
 
 
 def test_scan_folder_finds_sysml_files_recursively(tmp_path: Path) -> None:
@@ -44,6 +44,13 @@ def test_scan_folder_raises_for_missing_dir(tmp_path: Path) -> None:
         scan_folder(str(missing))
 
 
+def test_scan_folder_rejects_a_plain_file(tmp_path: Path) -> None:
+    model = tmp_path / "m.sysml"
+    model.write_text("package A;", encoding="utf-8")
+    with pytest.raises(NotADirectoryError, match="m.sysml"):
+        scan_folder(str(model))
+
+
 def test_scan_folder_finds_sysml_and_extracts_packages(tmp_path: Path) -> None:
     root = tmp_path / "models"
     root.mkdir()
@@ -64,3 +71,109 @@ def test_scan_folder_finds_sysml_and_extracts_packages(tmp_path: Path) -> None:
     assert "B" in package_text
     assert "package A" in package_text["A"]
     assert "package B" in package_text["B"]
+
+
+def test_scan_folder_parallel_matches_serial_and_keeps_first_definition(tmp_path: Path) -> None:
+    for i in range(8):
+        (tmp_path / f"p{i}.sysml").write_text(f"package P{i};\n", encoding="utf-8")
+    (tmp_path / "dup_a.sysml").write_text("package Dup { part a; }\n", encoding="utf-8")
+    (tmp_path / "dup_b.sysml").write_text("package Dup { part b; }\n", encoding="utf-8")
+
+    serial = scan_folder(str(tmp_path), jobs=1)
+    parallel = scan_folder(str(tmp_path), jobs=4)
+
+    assert parallel == serial
+    assert list(parallel) == list(serial)
+    assert set(parallel) == {f"P{i}" for i in range(8)} | {"Dup"}
+
+
+def test_parallel_scan_keeps_a_bounded_number_of_chunks_in_flight(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from windseeker.scan import _scan_in_pool
+
+    paths = []
+    for i in range(200):
+        paths.append(tmp_path / f"p{i:03d}.sysml")
+        paths[-1].write_text(f"package P{i};\n", encoding="utf-8")
+
+    submitted = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def submit(self, fn, chunk):
+            submitted.append(len(chunk))
+            return super().submit(fn, chunk)
+
+    with CountingPool(max_workers=2) as pool:
+        results = _scan_in_pool(pool, paths, workers=2)
+        first = next(results)
+        assert first[0][0][0] == "P0"
+        assert len(submitted) == 4  # workers * 2 chunks, not all 200 paths
+        names = [first[0][0][0]] + [packages[0][0] for packages, _, _ in results]
+
+    assert names == [f"P{i}" for i in range(200)]
+    assert sum(submitted) == 200
+
+
+def test_scan_folder_returns_lazy_span_records(tmp_path: Path) -> None:
+    src = tmp_path / "m.sysml"
+    src.write_text("// header\npackage A { import B; }\npackage B;\n", encoding="utf-8")
+
+    package_text = scan_folder(str(tmp_path))
+
+    rec = package_text.record("A")
+    assert rec.path == str(src.resolve())
+    assert src.read_bytes()[rec.start : rec.end] == b"package A { import B; }"
+    assert rec.imports == ("B",)
+    assert package_text["A"] == "package A { import B; }"
+
+
+def test_package_record_detects_source_changed_since_scan(tmp_path: Path) -> None:
+    src = tmp_path / "m.sysml"
+    src.write_text("package A { part x; }\n", encoding="utf-8")
+    package_text = scan_folder(str(tmp_path))
+
+    src.write_text("package A { part y; }\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        package_text["A"]
+
+
+def test_iter_packages_streams_records_in_source_order(tmp_path: Path) -> None:
+    (tmp_path / "m.sysml").write_text(
+        "package A { import B::*; }\npackage B;\npackage A;\n", encoding="utf-8"
+    )
+
+    stream = iter_packages(str(tmp_path))
+    first = next(stream)
+    assert (first.name, first.imports) == ("A", ("B",))
+
+    rest = list(stream)
+    assert [r.name for r in rest] == ["B", "A"]  # duplicates are left to the consumer
+
+
+def test_scan_folder_warns_on_unreadable_file_but_not_on_parser_bugs(
+    tmp_path: Path, monkeypatch, capsys
+) -> None:
+    (tmp_path / "a.sysml").write_text("package A;\n", encoding="utf-8")
+    (tmp_path / "b.sysml").write_text("package B;\n", encoding="utf-8")
+
+    import windseeker.scan as scan
+
+    real_mapped = scan._mapped
+
+    def flaky_mapped(path):
+        if path.name == "b.sysml":
+            raise PermissionError("denied")
+        return real_mapped(path)
+
+    monkeypatch.setattr(scan, "_mapped", flaky_mapped)
+    assert set(scan_folder(str(tmp_path))) == {"A"}
+    assert "could not read" in capsys.readouterr().out
+
+    def broken_parse(data):
+        raise RuntimeError("parser bug")
+
+    monkeypatch.setattr(scan, "parse_sysml", broken_parse)
+    with pytest.raises(RuntimeError, match="parser bug"):
+        scan_folder(str(tmp_path))
@@ -13,3 +13,38 @@ def test_topological_order_dependencies_first():
 
     assert order.index("C") < order.index("B")
     assert order.index("B") < order.index("A")
+
+
+def test_graph_analysis_memoizes_and_invalidates_on_mutation(monkeypatch):
+    import networkx as nx
+
+    from windseeker.graph import GraphAnalysis
+
+    calls = {"sort": 0}
+    real_sort = nx.topological_sort
+
+    def counting_sort(G):
+        calls["sort"] += 1
+        return real_sort(G)
+
+    monkeypatch.setattr("networkx.topological_sort", counting_sort)
+
+    G = nx.DiGraph([("A", "B"), ("B", "C")])
+    analysis = GraphAnalysis(G)
+
+    assert topological_packages(analysis) == ["C", "B", "A"]
+    assert topological_packages(analysis) == ["C", "B", "A"]
+    assert analysis.generations == [["C"], ["B"], ["A"]]
+    assert calls["sort"] == 1
+
+    G.add_edge("C", "D")
+    assert topological_packages(analysis) == ["D", "C", "B", "A"]
+    assert calls["sort"] == 2
+
+    # same node and edge counts, different edges
+    G.remove_edge("C", "D")
+    G.add_edge("D", "C")
+    analysis.invalidate()
+    order = topological_packages(analysis)
+    assert order.index("C") < order.index("D")
+    assert calls["sort"] == 3
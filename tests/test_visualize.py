@@ -27,3 +27,89 @@ def test_visualize_refuses_cycles(tmp_path: Path) -> None:
     G.add_edge("B", "A")  # cycle
     with pytest.raises(Exception):
         visualize_graph_to_file(G, out_path=str(tmp_path / "x.png"))
+
+
+def test_layered_layout_places_dependencies_below_and_untangles_layers() -> None:
+    from windseeker.visualize import layered_layout
+
+    # A and B each import their own dependency; initial alphabetical order crosses them
+    G = nx.DiGraph([("A", "Z"), ("B", "Y"), ("Z", "Base"), ("Y", "Base")])
+
+    pos = layered_layout(G)
+
+    for pkg, dep in G.edges:
+        assert pos[pkg][1] > pos[dep][1]
+    assert (pos["A"][0] < pos["B"][0]) == (pos["Z"][0] < pos["Y"][0])  # no crossing
+
+
+def test_auto_layout_switches_to_layered_for_large_graphs(monkeypatch) -> None:
+    from windseeker.visualize import AUTO_LAYERED_MIN_NODES, compute_layout
+
+    def fail(*a, **k):
+        raise AssertionError("kamada_kawai must not run on large graphs")
+
+    monkeypatch.setattr("windseeker.visualize.nx.kamada_kawai_layout", fail)
+    G = nx.path_graph(AUTO_LAYERED_MIN_NODES + 1, create_using=nx.DiGraph)
+
+    assert len(compute_layout(G, "auto")) == G.number_of_nodes()
+
+
+@pytest.mark.parametrize("suffix", ["svg", "dot", "graphml", "json", "html"])
+def test_direct_graph_writers_do_not_import_matplotlib(tmp_path: Path, suffix: str) -> None:
+    import subprocess
+    import sys
+
+    out = tmp_path / f"g.{suffix}"
+    code = (
+        "import sys, networkx as nx\n"
+        "from windseeker.visualize import visualize_graph_to_file\n"
+        "G = nx.DiGraph([('A', 'B'), ('A', 'C \"q\" <x>')])\n"
+        f"visualize_graph_to_file(G, {str(out)!r})\n"
+        "assert 'matplotlib' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+    text = out.read_text(encoding="utf-8")
+    if suffix == "json":
+        import json
+
+        data = json.loads(text)
+        assert {n["id"] for n in data["nodes"]} == {"A", "B", 'C "q" <x>'}
+        assert ["A", "B"] in data["edges"]
+    elif suffix == "html":
+        assert "<canvas" in text and "matplotlib" not in text
+    elif suffix == "dot":
+        assert '"A" -> "B";' in text and '"C \\"q\\" <x>"' in text
+    else:
+        import xml.etree.ElementTree as ET
+
+        ET.fromstring(text)  # well-formed despite quotes/brackets in names
+
+
+def test_graph_format_overrides_extension(tmp_path: Path) -> None:
+    G = nx.DiGraph([("A", "B")])
+    out = tmp_path / "imports.png"
+
+    visualize_graph_to_file(G, out_path=str(out), fmt="dot")
+
+    assert out.read_text(encoding="utf-8").startswith("digraph imports {")
+
+
+def test_html_explorer_embeds_compact_graph(tmp_path: Path) -> None:
+    import json
+    import re
+
+    G = nx.DiGraph([("App", "Lib::Core"), ("Lib::Core", "Base</script>")])
+    G.graph["unresolved_imports"] = {"Base</script>": {"Lib::Core"}}
+    out = tmp_path / "imports.html"
+
+    visualize_graph_to_file(G, out_path=str(out), layout="layered")
+
+    text = out.read_text(encoding="utf-8")
+    payload = re.search(r'id="graph-data">(.*?)</script>', text, re.S).group(1)
+    data = json.loads(payload)
+    names = data["names"]
+    assert len(data["x"]) == len(data["y"]) == len(names) == 3
+    pairs = {(names[a], names[b]) for a, b in zip(data["edges"][::2], data["edges"][1::2])}
+    assert pairs == set(G.edges)
+    assert [names[i] for i in data["unresolved"]] == ["Base</script>"]
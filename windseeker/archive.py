@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import os
+import sys
+import tarfile
+import tempfile
+import threading
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Dict, Iterator, Tuple
+
+from windseeker.ignore import ScanRules
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+
+def is_archive(path: Path) -> bool:
+    """True for a regular file with a .zip or (optionally compressed) .tar suffix."""
+    return path.is_file() and path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _member_path(name: str) -> str:
+    """Archive member name as a path relative to the archive root ('./a/b' -> 'a/b')."""
+    while name.startswith("./"):
+        name = name[2:]
+    return name.lstrip("/")
+
+
+def _is_compressed_tar(archive: str) -> bool:
+    return not archive.lower().endswith((".zip", ".tar"))
+
+
+def iter_archive_sysml(archive: Path, rules: ScanRules) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (member_name, data) for every .sysml member the rules accept, in archive order.
+
+    Members are read one at a time straight from the archive; nothing is extracted to disk.
+    Tar archives are read as a stream, so compressed tarballs are decompressed exactly once:
+    the yielded members are also kept, uncompressed, for later read_archive_member calls.
+    """
+    if archive.name.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and rules.accepts_path(_member_path(info.filename)):
+                    yield info.filename, zf.read(info)
+        return
+
+    reader = None
+    if _is_compressed_tar(str(archive)):
+        reader = _archive_reader(str(archive), os.stat(archive).st_mtime_ns)
+    with tarfile.open(archive, mode="r|*") as tf:
+        for member in tf:
+            if not member.isfile() or not rules.accepts_path(_member_path(member.name)):
+                continue
+            f = tf.extractfile(member)
+            if f is not None:
+                data = f.read()
+                if reader is not None:
+                    reader.keep(member.name, data)
+                yield member.name, data
+
+
+class _ArchiveReader:
+    """
+    One open archive for random-access reads of byte ranges of its members.
+
+    Zip members are opened through the central directory and read from the requested
+    offset. Plain tarballs are indexed by member data offset and read with a single seek.
+    Compressed tarballs cannot seek without decompressing again from the start, so their
+    .sysml members are written once, uncompressed, to an anonymous temporary file (by the
+    scan that reads them anyway, see iter_archive_sysml, or else in one streaming pass on
+    first use) and read from there. No member data is held in memory. Reads are serialized
+    with a lock because the open file position is shared.
+    """
+
+    def __init__(self, archive: str) -> None:
+        self._archive = archive
+        self._lock = threading.Lock()
+        self._zip: zipfile.ZipFile | None = None
+        self._file: IO[bytes] | None = None
+        # member name -> (offset of its data in _file, size)
+        self._members: Dict[str, Tuple[int, int]] = {}
+        self._complete = True
+        if archive.lower().endswith(".zip"):
+            self._zip = zipfile.ZipFile(archive)
+        elif _is_compressed_tar(archive):
+            self._file = tempfile.TemporaryFile()
+            self._complete = False
+        else:
+            with tarfile.open(archive, mode="r:") as tf:
+                self._members = {m.name: (m.offset_data, m.size) for m in tf if m.isfile()}
+            self._file = open(archive, "rb")
+
+    def keep(self, member: str, data: bytes) -> None:
+        """Spill one compressed-tarball member to the temporary file (once)."""
+        with self._lock:
+            self._keep(member, data)
+
+    def _keep(self, member: str, data: bytes) -> None:
+        if self._complete or member in self._members:
+            return
+        self._file.seek(0, os.SEEK_END)
+        self._members[member] = (self._file.tell(), len(data))
+        self._file.write(data)
+
+    def _keep_all(self) -> None:
+        with tarfile.open(self._archive, mode="r|*") as tf:
+            for member in tf:
+                if member.isfile() and member.name.endswith(".sysml"):
+                    f = tf.extractfile(member)
+                    if f is not None:
+                        self._keep(member.name, f.read())
+        self._complete = True
+
+    def read(self, member: str, start: int, end: int) -> bytes:
+        with self._lock:
+            if self._zip is not None:
+                with self._zip.open(member) as f:
+                    f.seek(start)
+                    return f.read(end - start)
+            if member not in self._members and not self._complete:
+                self._keep_all()
+            if member not in self._members:
+                raise KeyError(f"{member} not found in {self._archive}")
+            offset, size = self._members[member]
+            self._file.seek(offset + start)
+            return self._file.read(min(end, size) - start)
+
+
+@lru_cache(maxsize=8)
+def _archive_reader(archive: str, mtime_ns: int) -> _ArchiveReader:
+    # keyed by mtime so a rewritten archive is reopened; evicted readers close on collection
+    return _ArchiveReader(archive)
+
+
+def read_archive_member(archive: str, member: str, start: int = 0, end: int = -1) -> bytes:
+    """
+    Read bytes [start:end] of one member (end=-1: to the end of the member) through a
+    cached open handle on the archive.
+    """
+    reader = _archive_reader(archive, os.stat(archive).st_mtime_ns)
+    if end < 0:
+        end = sys.maxsize
+    return reader.read(member, start, end)
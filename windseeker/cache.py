@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Bump whenever the parser output for the same file could change, so stale entries
+# written by an older Windseeker are discarded instead of trusted.
+CACHE_VERSION = 3
+
+CACHE_FILE_NAME = "parse-cache.json"
+
+# One cached top-level package: (name, start, end, content_hash, imports, views)
+CachedPackage = List[Any]
+
+
+def file_digest(data: Union[bytes, mmap.mmap]) -> str:
+    """Content hash used as the fingerprint fallback when size/mtime are inconclusive."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """
+    Persistent per-file parse cache stored in <cache_dir>/parse-cache.json.
+
+    Entries are keyed by absolute file path and validated by (size, mtime_ns). If the
+    size matches but the mtime does not (e.g. a fresh checkout touched every file), the
+    content hash decides, so unchanged files are still hits.
+    """
+
+    def __init__(self, cache_dir: str = ".windseeker-cache") -> None:
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / CACHE_FILE_NAME
+        self.hits = 0
+        self.misses = 0
+        self._files: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"Warning: ignoring unreadable parse cache {self.path}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        files = data.get("files", {})
+        return files if isinstance(files, dict) else {}
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return str(path.resolve())
+
+    def lookup(self, path: Path) -> Optional[List[CachedPackage]]:
+        """Return cached packages for path if the file is unchanged, else None (counted as a miss)."""
+        entry = self._files.get(self._key(path))
+        if entry is not None:
+            try:
+                st = path.stat()
+            except OSError:
+                st = None
+
+            if st is not None and entry.get("size") == st.st_size:
+                if entry.get("mtime_ns") == st.st_mtime_ns:
+                    self.hits += 1
+                    return entry["packages"]
+
+                try:
+                    digest = file_digest(path.read_bytes())
+                except OSError:
+                    digest = None
+                if digest is not None and digest == entry.get("sha256"):
+                    entry["mtime_ns"] = st.st_mtime_ns
+                    self._dirty = True
+                    self.hits += 1
+                    return entry["packages"]
+
+        self.misses += 1
+        return None
+
+    def store(self, path: Path, *, sha256: str, packages: List[CachedPackage]) -> None:
+        """Record freshly parsed packages for path."""
+        try:
+            st = path.stat()
+        except OSError:
+            return
+        self._files[self._key(path)] = {
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": sha256,
+            "packages": packages,
+        }
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back to disk (atomically), dropping entries for deleted files."""
+        stale = [k for k in self._files if not os.path.exists(k)]
+        for k in stale:
+            del self._files[k]
+        if not self._dirty and not stale:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"version": CACHE_VERSION, "files": self._files}), encoding="utf-8"
+        )
+        os.replace(tmp, self.path)
+        self._dirty = False
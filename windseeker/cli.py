@@ -1,27 +1,67 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import typer
 
-from windseeker.pipeline import order_only, run_pipeline
+from windseeker.archive import is_archive
+from windseeker.notebook.build import CellBatching
+from windseeker.pipeline import ENGINES, impact, order_only, run_pipeline
 from windseeker.views.render import SvgRenderLimits
 
 app = typer.Typer(add_completion=True, help="SysML v2 dependency + notebook + view pipeline")
 
 
+def _model_folder(folder: Path) -> Path:
+    # --folder accepts files only so that archives can be scanned
+    if folder.is_file() and not is_archive(folder):
+        raise typer.BadParameter("must be a folder or a .zip/.tar[.gz|.bz2|.xz] archive")
+    return folder
+
+
 @app.command("run")
 def run(
     folder: Path = typer.Option(
-        Path("./tests"), "--folder", "-f", exists=True, file_okay=False, dir_okay=True
+        Path("./tests"),
+        "--folder",
+        "-f",
+        exists=True,
+        file_okay=True,
+        dir_okay=True,
+        callback=_model_folder,
+        help="Model folder, or a .zip/.tar[.gz] archive of one",
+    ),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", help="Parallel scan worker processes (0 = one per CPU)"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parse results for unchanged files"
+    ),
+    cache_dir: Path = typer.Option(
+        Path(".windseeker-cache"), "--cache-dir", help="Parse cache directory"
+    ),
+    include: List[str] = typer.Option(
+        [], "--include", help="Only scan .sysml files matching this glob (repeatable)"
+    ),
+    exclude: List[str] = typer.Option(
+        [], "--exclude", help="Skip files/directories matching this glob (repeatable)"
     ),
     write_graph: bool = typer.Option(True, "--graph/--no-graph", help="Write graph image"),
     graph_png: Path = typer.Option(
-        Path("imports.png"), "--graph-png", help="Graph image output path"
+        Path("imports.png"), "--graph-png", help="Graph output path (.png, .svg, .dot, ...)"
+    ),
+    graph_format: Optional[str] = typer.Option(
+        None,
+        "--graph-format",
+        help="png|svg|dot|graphml|json|html (default: from the --graph-png extension); "
+        "svg/dot/graphml/json/html are written without matplotlib, html is an interactive "
+        "explorer",
     ),
     graph_layout: str = typer.Option(
-        "kamada_kawai", "--graph-layout", help="spring|kamada_kawai|shell"
+        "auto",
+        "--graph-layout",
+        help="auto|layered|spring|kamada_kawai|shell (auto picks layered for large graphs)",
     ),
     sysml_out: Path = typer.Option(
         Path("packages_in_dependency_order.sysml"), "--sysml-out", help="Output .sysml file"
@@ -29,9 +69,38 @@ def run(
     notebook_out: Path = typer.Option(
         Path("packages_in_dependency_order.ipynb"), "--notebook-out", help="Output notebook"
     ),
+    compact_notebook: bool = typer.Option(
+        False,
+        "--compact-notebook/--indented-notebook",
+        help="Write the notebook as compact (non-indented) JSON",
+    ),
+    cell_batch: str = typer.Option(
+        "none",
+        "--cell-batch",
+        help="Group packages into fewer notebook cells: none, count:N, bytes:N[k|m] or "
+        "generation (one cell per topological generation)",
+    ),
     execute: bool = typer.Option(
         True, "--execute/--no-execute", help="Execute the generated notebook"
     ),
+    engine: str = typer.Option(
+        "notebook",
+        "--engine",
+        help="notebook: execute the notebook file via nbclient/nbconvert; kernel: send cells "
+        "straight to the SysML kernel and keep outputs in memory",
+    ),
+    notebook_artifacts: bool = typer.Option(
+        True,
+        "--notebook-artifacts/--no-notebook-artifacts",
+        help="With --engine kernel, also write the notebook and executed notebook files",
+    ),
+    kernels: int = typer.Option(
+        1,
+        "--kernels",
+        min=1,
+        help="With --engine kernel, render views on N kernels in parallel; each loads only "
+        "the packages its views need",
+    ),
     executed_notebook_out: Path = typer.Option(
         Path("packages_in_dependency_order_executed.ipynb"),
         "--executed-notebook-out",
@@ -69,6 +138,12 @@ def run(
         "--fail-on-view-errors/--allow-view-errors",
         help="If set, a %view rendering error fails the run (default: allow view errors)",
     ),
+    view: List[str] = typer.Option(
+        [], "--view", help="Only build/execute this view and the packages it needs (repeatable)"
+    ),
+    view_glob: List[str] = typer.Option(
+        [], "--view-glob", help="Like --view, selecting views by glob, e.g. 'Pkg::*' (repeatable)"
+    ),
     svg_max_dim_px: int = typer.Option(
         8000,
         "--svg-max-dim-px",
@@ -85,15 +160,35 @@ def run(
       scan -> graph -> validate -> outputs -> execute -> extract views
     """
     svg_limits = SvgRenderLimits(max_dim_px=svg_max_dim_px, max_pixels=svg_max_pixels)
+    if engine not in ENGINES:
+        raise typer.BadParameter(
+            f"unknown engine {engine!r} (expected {' or '.join(ENGINES)})", param_hint="--engine"
+        )
+    if kernels > 1 and engine != "kernel":
+        raise typer.BadParameter("--kernels > 1 requires --engine kernel", param_hint="--kernels")
+    try:
+        cell_batching = CellBatching.parse(cell_batch)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--cell-batch") from e
 
     result = run_pipeline(
         folder=str(folder),
+        jobs=jobs,
+        cache_dir=str(cache_dir) if use_cache else None,
+        include=include,
+        exclude=exclude,
         write_graph=write_graph,
         graph_png=str(graph_png),
         graph_layout=graph_layout,
+        graph_format=graph_format,
         sysml_out=str(sysml_out),
         notebook_out=str(notebook_out),
+        compact_notebook=compact_notebook,
+        cell_batching=cell_batching,
         execute=execute,
+        engine=engine,
+        notebook_artifacts=notebook_artifacts,
+        kernels=kernels,
         executed_notebook_out=str(executed_notebook_out),
         export_views=export_views,
         views_dir=str(views_dir),
@@ -106,11 +201,17 @@ def run(
         strict_missing=strict_missing,
         fail_on_view_errors=fail_on_view_errors,
         svg_limits=svg_limits,
+        view_names=view,
+        view_globs=view_glob,
     )
 
     typer.echo(f"Packages (nodes): {len(result.graph.nodes)}")
     typer.echo(f"Imports (edges): {len(result.graph.edges)}")
     typer.echo(f"Views found: {len(result.views)}")
+    if result.notebook_packages is not None:
+        typer.echo(f"Notebook sliced to {len(result.notebook_packages)} package(s)")
+    if result.cache_hits or result.cache_misses:
+        typer.echo(f"Parse cache: {result.cache_hits} hit(s), {result.cache_misses} miss(es)")
 
     if result.unresolved_imports:
         typer.echo(
@@ -120,10 +221,13 @@ def run(
             typer.echo(f"  - {k} (imported by: {', '.join(sorted(result.unresolved_imports[k]))})")
 
     typer.echo(f"Wrote sysml: {sysml_out}")
-    typer.echo(f"Wrote notebook: {notebook_out}")
+    artifacts = notebook_artifacts or not execute or engine != "kernel"
+    if artifacts:
+        typer.echo(f"Wrote notebook: {notebook_out}")
 
     if execute:
-        typer.echo(f"Executed notebook: {executed_notebook_out}")
+        if artifacts:
+            typer.echo(f"Executed notebook: {executed_notebook_out}")
         if export_views:
             typer.echo(f"Extracted {len(result.written_view_files)} view file(s) into: {views_dir}")
 
@@ -131,16 +235,100 @@ def run(
 @app.command("order")
 def order(
     folder: Path = typer.Option(
-        Path("./tests"), "--folder", "-f", exists=True, file_okay=False, dir_okay=True
+        Path("./tests"),
+        "--folder",
+        "-f",
+        exists=True,
+        file_okay=True,
+        dir_okay=True,
+        callback=_model_folder,
+        help="Model folder, or a .zip/.tar[.gz] archive of one",
     ),
     dependencies_first: bool = typer.Option(True, "--deps-first/--importers-first"),
+    graph_backend: str = typer.Option(
+        "networkx", "--graph-backend", help="networkx|compact (compact: large models)"
+    ),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", help="Parallel scan worker processes (0 = one per CPU)"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parse results for unchanged files"
+    ),
+    cache_dir: Path = typer.Option(
+        Path(".windseeker-cache"), "--cache-dir", help="Parse cache directory"
+    ),
+    include: List[str] = typer.Option(
+        [], "--include", help="Only scan .sysml files matching this glob (repeatable)"
+    ),
+    exclude: List[str] = typer.Option(
+        [], "--exclude", help="Skip files/directories matching this glob (repeatable)"
+    ),
 ):
     """Print the topological package order."""
-    order_list = order_only(folder=str(folder), dependencies_first=dependencies_first)
+    order_list = order_only(
+        folder=str(folder),
+        dependencies_first=dependencies_first,
+        jobs=jobs,
+        cache_dir=str(cache_dir) if use_cache else None,
+        include=include,
+        exclude=exclude,
+        backend=graph_backend,
+    )
     for i, pkg in enumerate(order_list, 1):
         typer.echo(f"{i:4d}. {pkg}")
 
 
+@app.command("impact")
+def impact_cmd(
+    targets: List[str] = typer.Argument(..., help="Changed package names or .sysml files"),
+    folder: Path = typer.Option(
+        Path("./tests"),
+        "--folder",
+        "-f",
+        exists=True,
+        file_okay=True,
+        dir_okay=True,
+        callback=_model_folder,
+        help="Model folder, or a .zip/.tar[.gz] archive of one",
+    ),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", help="Parallel scan worker processes (0 = one per CPU)"
+    ),
+    use_cache: bool = typer.Option(
+        True, "--cache/--no-cache", help="Reuse parse results for unchanged files"
+    ),
+    cache_dir: Path = typer.Option(
+        Path(".windseeker-cache"), "--cache-dir", help="Parse cache directory"
+    ),
+    include: List[str] = typer.Option(
+        [], "--include", help="Only scan .sysml files matching this glob (repeatable)"
+    ),
+    exclude: List[str] = typer.Option(
+        [], "--exclude", help="Skip files/directories matching this glob (repeatable)"
+    ),
+):
+    """List the packages and views transitively affected by changing packages or files."""
+    try:
+        result = impact(
+            folder=str(folder),
+            targets=targets,
+            jobs=jobs,
+            cache_dir=str(cache_dir) if use_cache else None,
+            include=include,
+            exclude=exclude,
+        )
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="TARGETS") from e
+
+    typer.echo(f"Changed: {', '.join(result.changed)}")
+    typer.echo(f"Affected packages: {len(result.packages)}")
+    for i, pkg in enumerate(result.packages, 1):
+        typer.echo(f"{i:4d}. {pkg}")
+    typer.echo(f"Affected views: {len(result.views)}")
+    for v in result.views:
+        typer.echo(f"  - {v}")
+
+
 def main():
     app()
 
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+class CompactImportGraph:
+    """
+    Import graph with interned integer package IDs and CSR adjacency in flat arrays.
+
+    Edges point package -> imported_package, as in the NetworkX graph. Node i is names[i];
+    its imports are targets[offsets[i]:offsets[i + 1]]. Costs a few bytes per node and edge
+    instead of several hundred, and traversals are plain integer loops. Reverse adjacency is
+    built on first use. Use to_networkx() only where NetworkX is really needed (drawing).
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        defined: Sequence[bool],
+        offsets: array,
+        targets: array,
+    ) -> None:
+        self.names = names
+        self.index: Dict[str, int] = {n: i for i, n in enumerate(names)}
+        self._defined = array("b", defined)
+        self.offsets = offsets
+        self.targets = targets
+        self._reverse: Optional[Tuple[array, array]] = None
+
+    @classmethod
+    def from_imports(cls, packages: Iterable[Tuple[str, Sequence[str]]]) -> "CompactImportGraph":
+        """Build from (package_name, imported top-level names) pairs; first definition wins."""
+        names: List[str] = []
+        index: Dict[str, int] = {}
+        defined: List[bool] = []
+        edges: Dict[int, List[int]] = {}
+
+        def intern(name: str) -> int:
+            i = index.get(name)
+            if i is None:
+                i = index[name] = len(names)
+                names.append(name)
+                defined.append(False)
+            return i
+
+        for pkg_name, imports in packages:
+            src = intern(pkg_name)
+            if defined[src]:
+                continue
+            defined[src] = True
+            out = edges.setdefault(src, [])
+            for imp in imports:
+                dst = intern(imp)
+                if dst not in out:
+                    out.append(dst)
+
+        offsets = array("q", [0])
+        targets = array("q")
+        for i in range(len(names)):
+            targets.extend(edges.get(i, ()))
+            offsets.append(len(targets))
+        return cls(names, defined, offsets, targets)
+
+    def number_of_nodes(self) -> int:
+        return len(self.names)
+
+    def number_of_edges(self) -> int:
+        return len(self.targets)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def _successors(self, i: int) -> array:
+        return self.targets[self.offsets[i] : self.offsets[i + 1]]
+
+    def _reverse_csr(self) -> Tuple[array, array]:
+        if self._reverse is None:
+            n = len(self.names)
+            counts = [0] * (n + 1)
+            for t in self.targets:
+                counts[t + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            offsets = array("q", counts)
+            fill = list(counts[:n])
+            sources = array("q", bytes(8 * len(self.targets)))
+            for src in range(n):
+                for k in range(self.offsets[src], self.offsets[src + 1]):
+                    t = self.targets[k]
+                    sources[fill[t]] = src
+                    fill[t] += 1
+            self._reverse = (offsets, sources)
+        return self._reverse
+
+    def imports_of(self, name: str) -> List[str]:
+        return [self.names[t] for t in self._successors(self.index[name])]
+
+    def importers_of(self, name: str) -> List[str]:
+        offsets, sources = self._reverse_csr()
+        i = self.index[name]
+        return [self.names[s] for s in sources[offsets[i] : offsets[i + 1]]]
+
+    def unresolved_imports(self, *, ignore: Set[str] | None = None) -> dict[str, set[str]]:
+        """Imported names with no definition -> importers, minus ignored names."""
+        ignore = ignore or set()
+        return {
+            name: set(self.importers_of(name))
+            for i, name in enumerate(self.names)
+            if not self._defined[i] and name not in ignore
+        }
+
+    def topological_order(self, *, dependencies_first: bool = True) -> Optional[List[str]]:
+        """Kahn's algorithm over the arrays; None if the graph has a cycle."""
+        n = len(self.names)
+        if dependencies_first:
+            # a package becomes ready once everything it imports has been emitted
+            offsets, adj = self._reverse_csr()
+            pending = [self.offsets[i + 1] - self.offsets[i] for i in range(n)]
+        else:
+            offsets, adj = self.offsets, self.targets
+            rev_offsets, _ = self._reverse_csr()
+            pending = [rev_offsets[i + 1] - rev_offsets[i] for i in range(n)]
+
+        ready = deque(i for i in range(n) if pending[i] == 0)
+        order: List[int] = []
+        while ready:
+            i = ready.popleft()
+            order.append(i)
+            for k in range(offsets[i], offsets[i + 1]):
+                j = adj[k]
+                pending[j] -= 1
+                if pending[j] == 0:
+                    ready.append(j)
+
+        if len(order) != n:
+            return None
+        return [self.names[i] for i in order]
+
+    def reverse_dependencies(self, name: str, *, transitive: bool = True) -> List[str]:
+        """Packages that import name (directly, or through any chain if transitive)."""
+        offsets, sources = self._reverse_csr()
+        start = self.index[name]
+        seen = {start}
+        queue = deque([start])
+        result: List[str] = []
+        while queue:
+            i = queue.popleft()
+            for k in range(offsets[i], offsets[i + 1]):
+                s = sources[k]
+                if s not in seen:
+                    seen.add(s)
+                    result.append(self.names[s])
+                    if transitive:
+                        queue.append(s)
+        return result
+
+    def to_networkx(self) -> nx.DiGraph:
+        """Equivalent NetworkX graph (same nodes, edges and unresolved_imports)."""
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from(self.names)
+        for i, name in enumerate(self.names):
+            G.add_edges_from((name, self.names[t]) for t in self._successors(i))
+        G.graph["unresolved_imports"] = self.unresolved_imports()
+        return G
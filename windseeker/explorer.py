@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+from html import escape
+from typing import IO, Dict, Tuple
+
+import networkx as nx
+
+# Self-contained page: the graph is embedded as compact JSON (names plus flat integer
+# arrays) and drawn on a <canvas>, so thousands of packages stay responsive. Namespaces are
+# the package name split on "::", "." and "_"; collapsing to depth d merges every package
+# into the node for its first d name segments, and clicking a merged node expands it.
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>@TITLE@</title>
+<style>
+html, body { margin: 0; height: 100%; overflow: hidden; font: 13px sans-serif; }
+#bar { display: flex; gap: 12px; align-items: center; padding: 6px 10px;
+       background: #f3f3f3; border-bottom: 1px solid #ccc; }
+#bar h1 { margin: 0; font-size: 14px; }
+#info { color: #555; }
+canvas { display: block; cursor: grab; }
+</style>
+</head>
+<body>
+<div id="bar">
+  <h1>@TITLE@</h1>
+  <input id="search" type="search" size="30" placeholder="Search packages (Enter jumps)">
+  <label>Collapse namespaces to depth
+    <select id="depth"><option value="0">off</option><option>1</option><option>2</option>
+    <option>3</option></select></label>
+  <span id="info"></span>
+</div>
+<canvas id="view"></canvas>
+<script type="application/json" id="graph-data">"""
+
+_HTML_TAIL = """</script>
+<script>
+"use strict";
+const data = JSON.parse(document.getElementById("graph-data").textContent);
+const total = data.names.length;
+const lowerNames = data.names.map((s) => s.toLowerCase());
+const segments = data.names.map((s) => s.split(/::|[._]/));
+const unresolved = new Set(data.unresolved);
+
+function normalize(values) {
+  let lo = Infinity, hi = -Infinity;
+  for (const v of values) { if (v < lo) lo = v; if (v > hi) hi = v; }
+  return values.map((v) => (v - lo) / (hi - lo || 1));
+}
+const px = normalize(data.x);
+const py = normalize(data.y).map((v) => 1 - v);  // dependencies at the bottom
+
+const bar = document.getElementById("bar");
+const canvas = document.getElementById("view");
+const ctx = canvas.getContext("2d");
+const search = document.getElementById("search");
+const depthSelect = document.getElementById("depth");
+const info = document.getElementById("info");
+
+let view = { x: 0, y: 0, k: 1 };  // screen = world * k + (x, y)
+let nodes = [], edges = [], screen = new Float64Array(0);
+let query = "", hovered = -1;
+const expanded = new Set();
+
+function clusterKey(i, depth) {
+  const seg = segments[i];
+  if (!depth || seg.length <= depth) return data.names[i];
+  const key = seg.slice(0, depth).join("::");
+  return expanded.has(key) ? data.names[i] : key;
+}
+
+function rebuild() {
+  const depth = Number(depthSelect.value);
+  const index = new Map();
+  const owner = new Int32Array(total);
+  nodes = [];
+  for (let i = 0; i < total; i++) {
+    const key = clusterKey(i, depth);
+    let c = index.get(key);
+    if (c === undefined) {
+      c = nodes.length;
+      index.set(key, c);
+      nodes.push({ key, members: [], x: 0, y: 0, bad: false });
+    }
+    const node = nodes[c];
+    node.members.push(i);
+    node.x += px[i];
+    node.y += py[i];
+    node.bad = node.bad || unresolved.has(i);
+    owner[i] = c;
+  }
+  for (const node of nodes) {
+    node.x /= node.members.length;
+    node.y /= node.members.length;
+    node.cluster = node.members.length > 1 || node.key !== data.names[node.members[0]];
+    node.r = node.cluster ? 4 + 2 * Math.sqrt(node.members.length) : 4;
+  }
+  const seen = new Set();
+  edges = [];
+  for (let e = 0; e < data.edges.length; e += 2) {
+    const a = owner[data.edges[e]], b = owner[data.edges[e + 1]];
+    const id = a * nodes.length + b;
+    if (a !== b && !seen.has(id)) { seen.add(id); edges.push(a, b); }
+  }
+  screen = new Float64Array(2 * nodes.length);
+  hovered = -1;
+  info.textContent = `${nodes.length} of ${total} node(s), ${edges.length / 2} edge(s) shown`;
+  draw();
+}
+
+function matches(node) {
+  return query !== "" && node.members.some((i) => lowerNames[i].includes(query));
+}
+
+function label(node) {
+  return node.cluster ? `${node.key} (${node.members.length})` : node.key;
+}
+
+function draw() {
+  canvas.width = innerWidth;
+  canvas.height = innerHeight - bar.offsetHeight;
+  const w = canvas.width, h = canvas.height;
+  for (let c = 0; c < nodes.length; c++) {
+    screen[2 * c] = (40 + nodes[c].x * (w - 80)) * view.k + view.x;
+    screen[2 * c + 1] = (40 + nodes[c].y * (h - 80)) * view.k + view.y;
+  }
+  ctx.clearRect(0, 0, w, h);
+  ctx.strokeStyle = "rgba(85, 85, 85, 0.35)";
+  ctx.beginPath();
+  for (let e = 0; e < edges.length; e += 2) {
+    const a = 2 * edges[e], b = 2 * edges[e + 1];
+    ctx.moveTo(screen[a], screen[a + 1]);
+    ctx.lineTo(screen[b], screen[b + 1]);
+  }
+  ctx.stroke();
+
+  const showAll = nodes.length <= 300 || view.k >= 3;
+  ctx.textAlign = "center";
+  for (let c = 0; c < nodes.length; c++) {
+    const x = screen[2 * c], y = screen[2 * c + 1], node = nodes[c];
+    if (x < -50 || y < -50 || x > w + 50 || y > h + 50) continue;
+    const hit = matches(node);
+    ctx.fillStyle = hit ? "#e69138" : node.bad ? "#f4cccc" : node.cluster ? "#b6d7a8" : "#cfe2f3";
+    ctx.beginPath();
+    ctx.arc(x, y, node.r, 0, 2 * Math.PI);
+    ctx.fill();
+    ctx.strokeStyle = "#333";
+    ctx.stroke();
+    if (showAll || hit || node.cluster || c === hovered) {
+      ctx.fillStyle = "#000";
+      ctx.font = c === hovered ? "bold 12px sans-serif" : "10px sans-serif";
+      ctx.fillText(label(node), x, y - node.r - 3);
+    }
+  }
+}
+
+function nodeAt(mx, my) {
+  let best = -1, bestDist = Infinity;
+  for (let c = 0; c < nodes.length; c++) {
+    const dx = screen[2 * c] - mx, dy = screen[2 * c + 1] - my, d = dx * dx + dy * dy;
+    const r = nodes[c].r + 3;
+    if (d <= r * r && d < bestDist) { best = c; bestDist = d; }
+  }
+  return best;
+}
+
+let drag = null;
+canvas.addEventListener("mousedown", (e) => { drag = { x: e.offsetX, y: e.offsetY, moved: 0 }; });
+canvas.addEventListener("mousemove", (e) => {
+  if (drag) {
+    view.x += e.offsetX - drag.x;
+    view.y += e.offsetY - drag.y;
+    drag.moved += Math.abs(e.offsetX - drag.x) + Math.abs(e.offsetY - drag.y);
+    drag.x = e.offsetX;
+    drag.y = e.offsetY;
+    draw();
+    return;
+  }
+  const c = nodeAt(e.offsetX, e.offsetY);
+  if (c !== hovered) { hovered = c; draw(); }
+});
+canvas.addEventListener("mouseup", (e) => {
+  const click = drag && drag.moved < 4;
+  drag = null;
+  if (!click) return;
+  const c = nodeAt(e.offsetX, e.offsetY);
+  if (c >= 0 && nodes[c].cluster) { expanded.add(nodes[c].key); rebuild(); }
+});
+canvas.addEventListener("wheel", (e) => {
+  e.preventDefault();
+  const f = Math.exp(-e.deltaY * 0.001);
+  view.x = e.offsetX - (e.offsetX - view.x) * f;
+  view.y = e.offsetY - (e.offsetY - view.y) * f;
+  view.k *= f;
+  draw();
+}, { passive: false });
+
+search.addEventListener("input", () => { query = search.value.trim().toLowerCase(); draw(); });
+search.addEventListener("keydown", (e) => {
+  if (e.key !== "Enter") return;
+  const c = nodes.findIndex(matches);
+  if (c < 0) return;
+  view.k = Math.max(view.k, 4);
+  view.x = 0;
+  view.y = 0;
+  draw();  // recompute screen positions at the new zoom, then center the match
+  view.x = canvas.width / 2 - screen[2 * c];
+  view.y = canvas.height / 2 - screen[2 * c + 1];
+  hovered = c;
+  draw();
+});
+depthSelect.addEventListener("change", () => { expanded.clear(); rebuild(); });
+addEventListener("resize", draw);
+
+if (total > 2000) depthSelect.value = "1";
+rebuild();
+</script>
+</body>
+</html>
+"""
+
+
+def write_explorer_html(
+    G: nx.DiGraph, pos: Dict[str, Tuple[float, float]], f: IO[str], title: str | None
+) -> None:
+    """
+    Write a self-contained interactive HTML page for the import graph.
+
+    The graph is serialized in one pass as {"names": [...], "x": [...], "y": [...],
+    "edges": [src0, dst0, src1, dst1, ...], "unresolved": [...]}, with nodes referred to by
+    their index in names. The page pans, zooms, searches and collapses by namespace in the
+    browser, so no image is rendered here.
+    """
+    index = {n: i for i, n in enumerate(G.nodes)}
+    unresolved = G.graph.get("unresolved_imports", {}) or {}
+    data = {
+        "title": title,
+        "names": list(index),
+        "x": [round(pos[n][0], 4) for n in index],
+        "y": [round(pos[n][1], 4) for n in index],
+        "edges": [i for u, v in G.edges for i in (index[u], index[v])],
+        "unresolved": [index[n] for n in unresolved if n in index],
+    }
+    page_title = escape(title or "Package Import Graph")
+    f.write(_HTML_HEAD.replace("@TITLE@", page_title))
+    # "</" would end the <script> element early
+    f.write(json.dumps(data, separators=(",", ":")).replace("</", "<\\/"))
+    f.write(_HTML_TAIL)
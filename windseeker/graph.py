@@ -1,67 +1,312 @@
 from __future__ import annotations
 
-from typing import Dict, List, Set
-
-import networkx as nx
+import time
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+from windseeker.compact import CompactImportGraph
 from windseeker.errors import ImportCycleError, MissingPackageError
+from windseeker.packages import PackageIndex, PackageRecord, content_hash
 from windseeker.parsing import parse_imports_from_package_text
 
+if TYPE_CHECKING:
+    # imported where used, so the compact backend never loads NetworkX
+    import networkx as nx
+
+
+def iter_package_imports(
+    packages: Union[Mapping[str, str], Iterable[PackageRecord]],
+) -> Iterator[Tuple[str, Sequence[str]]]:
+    """Yield (package_name, imported top-level names) from a text map or a record stream."""
+    if isinstance(packages, PackageIndex):
+        for pkg_name in packages:
+            yield pkg_name, packages.imports_of(pkg_name)
+    elif isinstance(packages, Mapping):
+        for pkg_name in packages:
+            yield pkg_name, parse_imports_from_package_text(pkg_name, packages[pkg_name])
+    else:
+        for record in packages:
+            yield record.name, record.imports
 
-def build_import_graph_from_package_text(package_text: Dict[str, str]) -> nx.DiGraph:
+
+def build_import_graph_from_package_text(
+    package_text: Union[Mapping[str, str], Iterable[PackageRecord]],
+    *,
+    backend: str = "networkx",
+) -> Union[nx.DiGraph, CompactImportGraph]:
     """
     Build directed graph:
         package --> imported_package
 
+    If package_text is a PackageIndex (as returned by scan_folder), the imports parsed at
+    scan time are reused instead of re-parsing each package text. It may also be any
+    iterable of PackageRecords (e.g. scan.iter_packages), which is consumed once, so the
+    graph is built while files are still being scanned; for duplicated names the first
+    record wins, as in scan_folder.
+
+    backend="compact" returns a CompactImportGraph (interned IDs, CSR arrays) instead, for
+    very large models; every function in this module accepts either kind of graph.
+
     Side effect:
         G.graph["unresolved_imports"] = dict[imported_pkg -> set(importers)]
     """
-    G = nx.DiGraph()
-    unresolved: dict[str, set[str]] = {}
+    if backend == "compact":
+        return CompactImportGraph.from_imports(iter_package_imports(package_text))
+    if backend != "networkx":
+        raise ValueError(f"Unknown graph backend: {backend}")
+    import networkx as nx
 
-    known_packages = set(package_text.keys())  # top-level only
+    G = nx.DiGraph()
+    known_packages: Set[str] = set()  # top-level only
 
-    for pkg_name, pkg_full_text in package_text.items():
+    for pkg_name, imports in iter_package_imports(package_text):
+        if pkg_name in known_packages:
+            continue
+        known_packages.add(pkg_name)
         G.add_node(pkg_name)
 
-        imports = parse_imports_from_package_text(pkg_name, pkg_full_text)
         for imp_top in imports:
             G.add_node(imp_top)
             G.add_edge(pkg_name, imp_top)
 
-            if imp_top not in known_packages:
-                unresolved.setdefault(imp_top, set()).add(pkg_name)
+    # only known packages have out-edges, so any unknown node is an unresolved import
+    unresolved: dict[str, set[str]] = {
+        n: set(G.predecessors(n)) for n in G.nodes if n not in known_packages
+    }
 
     G.graph["unresolved_imports"] = unresolved
     return G
 
 
-def find_cycles(G: nx.DiGraph) -> List[List[str]]:
-    return list(nx.simple_cycles(G))
+@dataclass(frozen=True)
+class CycleReport:
+    """One strongly connected component of the import graph that contains cycles."""
 
+    members: List[str]
+    cycles: List[List[str]]  # shortest representative cycles, not all of them
 
-def _format_cycles(cycles: List[List[str]], max_show: int = 25) -> str:
-    lines = []
-    for i, cyc in enumerate(cycles[:max_show], start=1):
-        if not cyc:
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+
+def _shortest_cycle_through(G: nx.DiGraph, start: str, component: Set[str]) -> List[str]:
+    """BFS inside one SCC for the shortest cycle start -> ... -> start (O(V + E))."""
+    parent: dict[str, str] = {}
+    frontier = [start]
+    while frontier:
+        nxt: List[str] = []
+        for u in frontier:
+            for v in G.successors(u):
+                if v == start:
+                    cycle = [u]
+                    while cycle[-1] != start:
+                        cycle.append(parent[cycle[-1]])
+                    return cycle[::-1]
+                if v in component and v not in parent:
+                    parent[v] = u
+                    nxt.append(v)
+        frontier = nxt
+    return [start]  # unreachable for a genuine SCC member
+
+
+def find_cycle_components(
+    G: GraphLike,
+    *,
+    max_cycles_per_component: int = 3,
+    max_components: int = 25,
+    time_budget_s: float = 2.0,
+) -> List[CycleReport]:
+    """
+    Report the cyclic strongly connected components of G, largest first.
+
+    Components are found in linear time (Tarjan) and all of them are returned. For the
+    first max_components, up to max_cycles_per_component distinct shortest cycles are
+    added, each costing one BFS; once time_budget_s is spent, the remaining components get
+    no cycles. Unlike enumerating simple cycles, this stays linear however tangled the
+    model is.
+    """
+    import networkx as nx
+
+    if isinstance(G, CompactImportGraph):
+        if G.topological_order() is not None:
+            return []  # acyclic: skip the NetworkX copy
+        G = G.to_networkx()
+    elif isinstance(G, GraphAnalysis):
+        G = G.graph
+    components = [
+        sorted(c)
+        for c in nx.strongly_connected_components(G)
+        if len(c) > 1 or G.has_edge(next(iter(c)), next(iter(c)))
+    ]
+    components.sort(key=lambda c: (-len(c), c[0]))
+
+    deadline = time.monotonic() + time_budget_s
+    reports: List[CycleReport] = []
+    for n, members in enumerate(components):
+        if n >= max_components:
+            reports.append(CycleReport(members=members, cycles=[]))
             continue
-        loop = " -> ".join(cyc + [cyc[0]])
-        lines.append(f"{i}. {loop}")
-    if len(cycles) > max_show:
-        lines.append(f"... and {len(cycles) - max_show} more")
+        component = set(members)
+        cycles: List[List[str]] = []
+        covered: Set[str] = set()
+        for start in members:
+            if len(cycles) >= max_cycles_per_component or time.monotonic() > deadline:
+                break
+            if start in covered:
+                continue
+            cycle = _shortest_cycle_through(G, start, component)
+            covered.update(cycle)
+            cycles.append(cycle)
+        reports.append(CycleReport(members=members, cycles=cycles))
+    return reports
+
+
+def find_cycles(G: GraphLike) -> List[List[str]]:
+    """Representative shortest cycles (bounded in number; see find_cycle_components)."""
+    return [cyc for report in find_cycle_components(G) for cyc in report.cycles]
+
+
+def _format_cycle_components(reports: List[CycleReport], total: int, max_members: int = 10) -> str:
+    lines = []
+    for i, report in enumerate(reports, start=1):
+        shown = ", ".join(report.members[:max_members])
+        more = f", ... (+{report.size - max_members})" if report.size > max_members else ""
+        lines.append(f"{i}. {report.size} package(s) in a cycle: {shown}{more}")
+        for cyc in report.cycles:
+            lines.append("     " + " -> ".join(cyc + [cyc[0]]))
+    if total > len(reports):
+        lines.append(f"... and {total - len(reports)} more cyclic component(s)")
     return "\n".join(lines)
 
 
-def assert_acyclic_or_raise(G: nx.DiGraph) -> None:
-    """Ensure there are no cycles; raise ImportCycleError if cycles exist."""
-    if nx.is_directed_acyclic_graph(G):
+class GraphAnalysis:
+    """
+    Memoized analysis of one import graph: cycle status, topological orders, generations and
+    unresolved imports are each computed at most once and shared by every pipeline stage.
+
+    Every function below that takes a graph also accepts a GraphAnalysis. Code that edits
+    the graph after analyzing it must call invalidate(). As a safety net, results are also
+    dropped when the node or edge count changes, which costs O(1) per lookup; an edit that
+    keeps both counts (e.g. rewiring one edge) is only seen through invalidate().
+    """
+
+    def __init__(self, G: nx.DiGraph) -> None:
+        self.graph = G
+        self._memo: Dict[Hashable, Any] = {}
+        self._stamp = self._fingerprint()
+
+    @classmethod
+    def of(cls, G: GraphLike) -> "GraphAnalysis":
+        """Return G itself if it is already a GraphAnalysis, else analyze it."""
+        if isinstance(G, GraphAnalysis):
+            return G
+        if isinstance(G, CompactImportGraph):
+            return cls(G.to_networkx())
+        return cls(G)
+
+    def _fingerprint(self) -> Tuple[int, int]:
+        return self.graph.number_of_nodes(), self.graph.number_of_edges()
+
+    def invalidate(self) -> None:
+        """Forget all memoized results."""
+        self._memo.clear()
+        self._stamp = self._fingerprint()
+
+    def _get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if self._fingerprint() != self._stamp:
+            self.invalidate()
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    @property
+    def is_acyclic(self) -> bool:
+        import networkx as nx
+
+        return self._get("acyclic", lambda: nx.is_directed_acyclic_graph(self.graph))
+
+    @property
+    def cycle_components(self) -> List[CycleReport]:
+        """Cyclic strongly connected components (see find_cycle_components)."""
+        return self._get("cycles", lambda: find_cycle_components(self.graph))
+
+    def assert_acyclic(self) -> None:
+        """Raise ImportCycleError if the graph has cycles."""
+        if self.is_acyclic:
+            return
+        reports = self.cycle_components
+        msg = "Critical import recursion loop(s) detected:\n" + _format_cycle_components(
+            reports[:25], len(reports)
+        )
+        raise ImportCycleError(msg)
+
+    def topological_order(self, *, dependencies_first: bool = True) -> List[str]:
+        """Topological sort of package nodes (see topological_packages); returns a copy."""
+
+        def compute() -> List[str]:
+            import networkx as nx
+
+            self.assert_acyclic()
+            H = self.graph.reverse(copy=False) if dependencies_first else self.graph
+            return list(nx.topological_sort(H))
+
+        return list(self._get(("topo", dependencies_first), compute))
+
+    @property
+    def generations(self) -> List[List[str]]:
+        """Topological generations, dependencies first: each only imports earlier ones."""
+
+        def compute() -> List[List[str]]:
+            import networkx as nx
+
+            self.assert_acyclic()
+            return [sorted(g) for g in nx.topological_generations(self.graph.reverse(copy=False))]
+
+        return self._get("generations", compute)
+
+    def unresolved_imports(self, *, ignore: Set[str] | None = None) -> dict[str, set[str]]:
+        """Unresolved imports (imported name -> importers), minus ignored names."""
+        unresolved: dict[str, set[str]] = self.graph.graph.get("unresolved_imports", {}) or {}
+        ignore = ignore or set()
+        return {k: v for k, v in unresolved.items() if k not in ignore}
+
+
+GraphLike = Union["nx.DiGraph", GraphAnalysis, CompactImportGraph]
+
+
+def _compact_order(G: CompactImportGraph, *, dependencies_first: bool) -> List[str]:
+    order = G.topological_order(dependencies_first=dependencies_first)
+    if order is None:
+        # only a failing run pays for the NetworkX copy used to describe the cycles
+        GraphAnalysis.of(G).assert_acyclic()
+        raise AssertionError("unreachable: cyclic graph passed the cycle check")
+    return order
+
+
+def assert_acyclic_or_raise(G: GraphLike) -> None:
+    """Ensure there are no cycles; raise ImportCycleError (in linear time) if cycles exist."""
+    if isinstance(G, CompactImportGraph):
+        _compact_order(G, dependencies_first=True)
         return
-    cycles = list(nx.simple_cycles(G))
-    msg = "Critical import recursion loop(s) detected:\n" + _format_cycles(cycles)
-    raise ImportCycleError(msg)
+    GraphAnalysis.of(G).assert_acyclic()
 
 
-def topological_packages(G: nx.DiGraph, *, dependencies_first: bool = True) -> List[str]:
+def topological_packages(G: GraphLike, *, dependencies_first: bool = True) -> List[str]:
     """
     Return a topological sort of package nodes.
 
@@ -69,18 +314,74 @@ def topological_packages(G: nx.DiGraph, *, dependencies_first: bool = True) -> L
       - dependencies_first=True: imported packages appear BEFORE importers
       - dependencies_first=False: importers appear before dependencies
     """
-    assert_acyclic_or_raise(G)
-    H = G.reverse(copy=False) if dependencies_first else G
-    return list(nx.topological_sort(H))
+    if isinstance(G, CompactImportGraph):
+        return _compact_order(G, dependencies_first=dependencies_first)
+    return GraphAnalysis.of(G).topological_order(dependencies_first=dependencies_first)
 
 
-def get_unresolved_imports(G: nx.DiGraph, *, ignore: Set[str] | None = None) -> dict[str, set[str]]:
+def get_unresolved_imports(G: GraphLike, *, ignore: Set[str] | None = None) -> dict[str, set[str]]:
     """
     Return unresolved imports dict, optionally filtering ignored imports.
     """
-    ignore = ignore or set()
-    unresolved: dict[str, set[str]] = G.graph.get("unresolved_imports", {}) or {}
-    return {k: v for k, v in unresolved.items() if k not in ignore}
+    if isinstance(G, CompactImportGraph):
+        return G.unresolved_imports(ignore=ignore)
+    return GraphAnalysis.of(G).unresolved_imports(ignore=ignore)
+
+
+def reverse_dependencies(G: GraphLike, package: str, *, transitive: bool = True) -> List[str]:
+    """
+    Packages that import package: directly, or (transitive=True) through any import chain.
+    Listed nearest first.
+    """
+    if isinstance(G, CompactImportGraph):
+        return G.reverse_dependencies(package, transitive=transitive)
+    g = G.graph if isinstance(G, GraphAnalysis) else G
+    if not transitive:
+        return list(g.predecessors(package))
+    import networkx as nx
+
+    return list(nx.bfs_tree(g.reverse(copy=False), package))[1:]
+
+
+def dependency_closure(G: GraphLike, packages: Iterable[str]) -> Set[str]:
+    """packages plus every package they (transitively) import; unknown names are skipped."""
+    if isinstance(G, CompactImportGraph):
+        closure: Set[str] = set()
+        stack = [p for p in packages if p in G]
+        while stack:
+            n = stack.pop()
+            if n not in closure:
+                closure.add(n)
+                stack.extend(G.imports_of(n))
+        return closure
+    import networkx as nx
+
+    g = G.graph if isinstance(G, GraphAnalysis) else G
+    closure = set()
+    for p in packages:
+        if p in g and p not in closure:
+            closure.add(p)
+            closure |= nx.descendants(g, p)
+    return closure
+
+
+def closure_hashes(G: GraphLike, own_hashes: Mapping[str, str]) -> Dict[str, str]:
+    """
+    Per package, a hash of its own hash plus the closure hashes of everything it imports,
+    i.e. a Merkle hash of its whole dependency closure: it changes exactly when the package
+    or one of its (transitive) dependencies changes. Computed in one dependencies-first pass.
+    Names missing from own_hashes (unresolved imports) contribute only their name.
+    """
+    result: Dict[str, str] = {}
+    for name in topological_packages(G, dependencies_first=True):
+        if isinstance(G, CompactImportGraph):
+            deps = G.imports_of(name)
+        else:
+            deps = (G.graph if isinstance(G, GraphAnalysis) else G).successors(name)
+        parts = [own_hashes.get(name, f"missing:{name}")]
+        parts.extend(sorted(result[d] for d in deps))
+        result[name] = content_hash("\n".join(parts).encode("utf-8"))
+    return result
 
 
 def format_unresolved_imports(unresolved: dict[str, set[str]]) -> str:
@@ -92,7 +393,7 @@ def format_unresolved_imports(unresolved: dict[str, set[str]]) -> str:
 
 
 def assert_no_unresolved_imports_or_raise(
-    G: nx.DiGraph,
+    G: GraphLike,
     *,
     ignore: Set[str] | None = None,
     strict: bool = False,
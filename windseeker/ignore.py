@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+IGNORE_FILE_NAME = ".windseekerignore"
+
+# Never worth descending into when looking for models.
+DEFAULT_EXCLUDES: Tuple[str, ...] = (
+    ".git/",
+    ".hg/",
+    ".svn/",
+    ".venv/",
+    "venv/",
+    ".tox/",
+    ".nox/",
+    "node_modules/",
+    "__pycache__/",
+    ".windseeker-cache/",
+)
+
+
+def _parse_pattern(pattern: str) -> Tuple[str, bool]:
+    """Split a glob into (pattern, directories_only); a trailing '/' means directories only."""
+    dir_only = pattern.endswith("/")
+    return pattern.rstrip("/"), dir_only
+
+
+def _matches(pattern: str, rel_path: str, name: str) -> bool:
+    # 'build' matches that name anywhere; 'models/old' or '/build' match from the scan root
+    if "/" in pattern:
+        return fnmatchcase(rel_path, pattern.lstrip("/"))
+    return fnmatchcase(name, pattern)
+
+
+def read_ignore_file(path: Path) -> List[str]:
+    """Read glob patterns from an ignore file (one per line; blanks and '#' comments skipped)."""
+    patterns: List[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            patterns.append(line)
+    return patterns
+
+
+@dataclass(frozen=True)
+class ScanRules:
+    """
+    Which files scan_folder reads and which directories it never enters.
+
+    Patterns are shell globs matched against the entry name, or against the path relative
+    to the scan root when they contain a '/' ('*' also matches '/'). A trailing '/' limits
+    an exclude to directories. Only .sysml files are ever scanned; if include patterns are
+    given, a file must also match one of them.
+    """
+
+    include: Tuple[str, ...] = ()
+    exclude: Tuple[str, ...] = DEFAULT_EXCLUDES
+    _exclude: Tuple[Tuple[str, bool], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_exclude", tuple(_parse_pattern(p) for p in self.exclude))
+
+    @classmethod
+    def for_root(
+        cls,
+        root: Path,
+        *,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+    ) -> "ScanRules":
+        """Default excludes + <root>/.windseekerignore (if present) + the given globs."""
+        patterns = list(DEFAULT_EXCLUDES)
+        ignore_file = root / IGNORE_FILE_NAME
+        if ignore_file.is_file():
+            patterns.extend(read_ignore_file(ignore_file))
+        patterns.extend(exclude or ())
+        return cls(include=tuple(include or ()), exclude=tuple(patterns))
+
+    def excludes(self, rel_path: str, name: str, *, is_dir: bool) -> bool:
+        for pattern, dir_only in self._exclude:
+            if dir_only and not is_dir:
+                continue
+            if _matches(pattern, rel_path, name):
+                return True
+        return False
+
+    def includes_file(self, rel_path: str, name: str) -> bool:
+        if not name.endswith(".sysml") or self.excludes(rel_path, name, is_dir=False):
+            return False
+        return not self.include or any(_matches(p, rel_path, name) for p in self.include)
+
+    def accepts_path(self, rel_path: str) -> bool:
+        """includes_file() for a path whose parent directories were never walked (archives)."""
+        parts = rel_path.split("/")
+        for i in range(1, len(parts)):
+            if self.excludes("/".join(parts[:i]), parts[i - 1], is_dir=True):
+                return False
+        return self.includes_file(rel_path, parts[-1])
+
+
+def walk_sysml_files(root: Path, rules: ScanRules) -> Iterator[Path]:
+    """
+    Yield the .sysml files under root that the rules accept, in sorted path order.
+
+    Excluded directories are pruned before they are opened, so their subtrees cost no
+    stat calls at all. Symlinked directories are not followed.
+    """
+    stack: List[Tuple[str, str]] = [(str(root), "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs: List[Tuple[str, str]] = []
+        for entry in entries:
+            rel = f"{rel_dir}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not rules.excludes(rel, entry.name, is_dir=True):
+                        subdirs.append((entry.path, rel + "/"))
+                elif entry.is_file() and rules.includes_file(rel, entry.name):
+                    yield Path(entry.path)
+            except OSError:
+                continue
+
+        # LIFO stack: push in reverse so subdirectories are visited in sorted order
+        stack.extend(reversed(subdirs))
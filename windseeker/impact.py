@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from windseeker.graph import GraphLike, reverse_dependencies, topological_packages
+from windseeker.packages import PackageIndex
+
+# Bump whenever the saved index layout changes
+INDEX_VERSION = 1
+
+INDEX_FILE_NAME = "reachability-index.json"
+
+
+def import_fingerprint(package_text: PackageIndex) -> str:
+    """Hash of every scanned package and its imports: equal fingerprints mean equal graphs."""
+    h = hashlib.sha256()
+    for record in package_text.records():
+        h.update("\0".join((record.name,) + record.imports).encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+class ReachabilityIndex:
+    """
+    Precomputed reverse-dependency index of an (acyclic) import graph.
+
+    Packages are numbered in dependencies-first topological order, so everything that
+    (transitively) imports a package has a larger number, and each package's direct
+    importers are stored as flat integer arrays (CSR). "What is affected if X changes" is
+    then a BFS over plain ints whose result, sorted by number, is already in dependency
+    order. Memory is O(V + E), and save()/load() let later runs reuse the index while the
+    model's imports are unchanged (see import_fingerprint).
+    """
+
+    def __init__(self, G: GraphLike) -> None:
+        self.order: List[str] = topological_packages(G, dependencies_first=True)
+        self.position: Dict[str, int] = {n: i for i, n in enumerate(self.order)}
+        self._offsets = array("q", [0])
+        self._importers = array("q")
+        for name in self.order:
+            self._importers.extend(
+                self.position[p] for p in reverse_dependencies(G, name, transitive=False)
+            )
+            self._offsets.append(len(self._importers))
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> Optional["ReachabilityIndex"]:
+        """The index saved at path, or None if it is missing, unreadable or for other imports."""
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"Warning: ignoring unreadable reachability index {path}: {e}")
+            return None
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != INDEX_VERSION
+            or data.get("fingerprint") != fingerprint
+        ):
+            return None
+        index = cls.__new__(cls)
+        index.order = data["order"]
+        index.position = {n: i for i, n in enumerate(index.order)}
+        index._offsets = array("q", data["offsets"])
+        index._importers = array("q", data["importers"])
+        return index
+
+    def save(self, path: Path, fingerprint: str) -> None:
+        """Write the index to path (atomically), tagged with the model's import fingerprint."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "version": INDEX_VERSION,
+                    "fingerprint": fingerprint,
+                    "order": self.order,
+                    "offsets": self._offsets.tolist(),
+                    "importers": self._importers.tolist(),
+                }
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, path)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.position
+
+    def affected_packages(self, changed: Iterable[str]) -> List[str]:
+        """
+        The changed packages plus everything that transitively imports them, in dependency
+        order (dependencies first). Unknown names are ignored.
+        """
+        seen = {self.position[n] for n in changed if n in self.position}
+        queue = deque(seen)
+        offsets, importers = self._offsets, self._importers
+        while queue:
+            i = queue.popleft()
+            for k in range(offsets[i], offsets[i + 1]):
+                j = importers[k]
+                if j not in seen:
+                    seen.add(j)
+                    queue.append(j)
+        return [self.order[i] for i in sorted(seen)]
+
+
+def views_of_packages(views: Iterable[str], packages: Iterable[str]) -> List[str]:
+    """Fully-qualified view names (see collect_all_views) owned by one of packages."""
+    owners = set(packages)
+    return [v for v in views if v.split("::", 1)[0] in owners]
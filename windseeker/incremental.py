@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Union
+
+import networkx as nx
+
+from windseeker.errors import ImportCycleError
+from windseeker.graph import iter_package_imports, topological_packages
+from windseeker.packages import PackageRecord
+
+
+class IncrementalImportGraph:
+    """
+    Import graph for long-lived processes (watch mode, editor integration) that is updated
+    one package at a time instead of being rebuilt.
+
+    graph is the same package -> imported_package DiGraph (with
+    graph.graph["unresolved_imports"]) that build_import_graph_from_package_text returns,
+    kept current after every update. A dependencies-first topological order is maintained
+    with the Pearce-Kelly dynamic topological sort: inserting an import only reorders the
+    packages between its two endpoints, and a cycle is detected by searching that region
+    alone, never the whole graph.
+    """
+
+    def __init__(self) -> None:
+        self.graph = nx.DiGraph()
+        self.graph.graph["unresolved_imports"] = {}
+        self._defined: Set[str] = set()
+        # position in the dependencies-first order (gaps are fine, only relative order counts)
+        self._ord: Dict[str, int] = {}
+        self._next_ord = 0
+        self._order_cache: Optional[List[str]] = None
+
+    @classmethod
+    def from_packages(
+        cls, package_text: Union[Mapping[str, str], Iterable[PackageRecord]]
+    ) -> "IncrementalImportGraph":
+        """Initial build from the same inputs as build_import_graph_from_package_text."""
+        inc = cls()
+        for pkg_name, imports in iter_package_imports(package_text):
+            if pkg_name not in inc._defined:
+                inc._define(pkg_name)
+                for imp in imports:
+                    inc._add_node(imp)
+                    inc.graph.add_edge(pkg_name, imp)
+                    inc._note_import(pkg_name, imp)
+        # one full sort to seed the order; updates are incremental from here on
+        for i, name in enumerate(topological_packages(inc.graph, dependencies_first=True)):
+            inc._ord[name] = i
+        inc._next_ord = len(inc._ord)
+        return inc
+
+    @property
+    def _unresolved(self) -> dict[str, set[str]]:
+        return self.graph.graph["unresolved_imports"]
+
+    def _add_node(self, name: str) -> None:
+        if name not in self._ord:
+            self.graph.add_node(name)
+            # a new node has no edges yet, so the end of the order is always valid
+            self._ord[name] = self._next_ord
+            self._next_ord += 1
+            self._order_cache = None
+
+    def _define(self, name: str) -> None:
+        self._add_node(name)
+        self._defined.add(name)
+        self._unresolved.pop(name, None)
+
+    def _note_import(self, pkg: str, imp: str) -> None:
+        if imp not in self._defined:
+            self._unresolved.setdefault(imp, set()).add(pkg)
+
+    def _drop_if_orphan(self, name: str) -> None:
+        if name not in self._defined and self.graph.in_degree(name) == 0:
+            self.graph.remove_node(name)
+            self._unresolved.pop(name, None)
+            del self._ord[name]
+            self._order_cache = None
+
+    def _remove_import(self, pkg: str, imp: str) -> None:
+        self.graph.remove_edge(pkg, imp)
+        importers = self._unresolved.get(imp)
+        if importers is not None:
+            importers.discard(pkg)
+        self._drop_if_orphan(imp)
+
+    def _insert_import(self, pkg: str, imp: str) -> None:
+        """Add pkg -> imp, restoring "imp before pkg" (Pearce-Kelly) or raising on a cycle."""
+        self._add_node(imp)
+        lb, ub = self._ord[pkg], self._ord[imp]
+        if lb > ub:
+            self.graph.add_edge(pkg, imp)
+            self._note_import(pkg, imp)
+            return
+
+        # packages that (transitively) import pkg and are not yet after imp
+        forward: List[str] = []
+        parent: Dict[str, str] = {pkg: pkg}
+        stack = [pkg]
+        while stack:
+            n = stack.pop()
+            forward.append(n)
+            for importer in self.graph.predecessors(n):
+                if importer == imp:
+                    chain = [imp, n]
+                    while chain[-1] != pkg:
+                        chain.append(parent[chain[-1]])
+                    cycle = [pkg] + chain[:-1]
+                    raise ImportCycleError(
+                        "Critical import recursion loop(s) detected:\n1. "
+                        + " -> ".join(cycle + [pkg])
+                    )
+                if importer not in parent and self._ord[importer] <= ub:
+                    parent[importer] = n
+                    stack.append(importer)
+
+        # packages imp (transitively) depends on that are not yet before pkg
+        backward: List[str] = []
+        seen = {imp}
+        stack = [imp]
+        while stack:
+            n = stack.pop()
+            backward.append(n)
+            for dep in self.graph.successors(n):
+                if dep not in seen and self._ord[dep] >= lb:
+                    seen.add(dep)
+                    stack.append(dep)
+
+        forward.sort(key=self._ord.__getitem__)
+        backward.sort(key=self._ord.__getitem__)
+        slots = sorted(self._ord[n] for n in backward + forward)
+        for name, slot in zip(backward + forward, slots):
+            self._ord[name] = slot
+
+        self.graph.add_edge(pkg, imp)
+        self._note_import(pkg, imp)
+        self._order_cache = None
+
+    def set_package(self, name: str, imports: Sequence[str]) -> None:
+        """
+        Add a package or replace its imports (e.g. after the file defining it was saved).
+
+        Raises ImportCycleError, leaving the graph unchanged, if the new imports would
+        introduce a cycle.
+        """
+        wanted = list(dict.fromkeys(i for i in imports if i != name))
+        was_defined = name in self._defined
+        old = list(self.graph.successors(name)) if name in self.graph else []
+
+        self._define(name)
+        for imp in old:
+            if imp not in wanted:
+                self._remove_import(name, imp)
+
+        added: List[str] = []
+        try:
+            for imp in wanted:
+                if not self.graph.has_edge(name, imp):
+                    self._insert_import(name, imp)
+                    added.append(imp)
+        except ImportCycleError:
+            for imp in added:
+                self._remove_import(name, imp)
+            for imp in old:
+                if not self.graph.has_edge(name, imp):
+                    self._insert_import(name, imp)
+            if not was_defined:
+                self.remove_package(name)
+            raise
+
+    def set_record(self, record: PackageRecord) -> None:
+        """set_package() from a scanned PackageRecord."""
+        self.set_package(record.name, record.imports)
+
+    def remove_package(self, name: str) -> None:
+        """Remove a package definition; if others still import it, it becomes unresolved."""
+        if name not in self._defined:
+            return
+        for imp in list(self.graph.successors(name)):
+            self._remove_import(name, imp)
+        self._defined.discard(name)
+        importers = set(self.graph.predecessors(name))
+        if importers:
+            self._unresolved[name] = importers
+        self._drop_if_orphan(name)
+
+    def topological_order(self, *, dependencies_first: bool = True) -> List[str]:
+        """Current topological order (no re-sort of the graph, only of the maintained keys)."""
+        if self._order_cache is None:
+            self._order_cache = sorted(self._ord, key=self._ord.__getitem__)
+        order = list(self._order_cache)
+        return order if dependencies_first else order[::-1]
+
+    def unresolved_imports(self, *, ignore: Set[str] | None = None) -> dict[str, set[str]]:
+        """Unresolved imports (imported name -> importers), minus ignored names."""
+        ignore = ignore or set()
+        return {k: set(v) for k, v in self._unresolved.items() if k not in ignore}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._defined
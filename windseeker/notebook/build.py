@@ -1,106 +1,259 @@
 from __future__ import annotations
 
 import json
-import uuid
-from pathlib import Path
-from typing import Dict, List
+import re
+from dataclasses import dataclass
+from typing import IO, Any, Collection, Dict, Iterable, Iterator, List, Mapping
 
-import networkx as nx
+from windseeker.graph import GraphAnalysis, GraphLike, closure_hashes, topological_packages
+from windseeker.packages import PackageIndex, content_hash
 
-from windseeker.graph import topological_packages
 
+_NOTEBOOK_METADATA = {
+    "kernelspec": {"display_name": "SysML", "language": "sysml", "name": "sysml"},
+    "language_info": {
+        "codemirror_mode": "sysml",
+        "file_extension": ".sysml",
+        "mimetype": "text/x-sysml",
+        "name": "SysML",
+        "pygments_lexer": "java",
+        "version": "1.0.0",
+    },
+}
 
-def write_notebook_in_dependency_order(
-    G: nx.DiGraph,
-    package_text: Dict[str, str],
-    *,
-    views: List[str] | None = None,
-    out_path: str = "packages_in_dependency_order.ipynb",
-) -> None:
+
+@dataclass(frozen=True)
+class CellBatching:
     """
-    Write a Jupyter notebook where the entire notebook uses the SysML kernel.
-    Each top-level package becomes one code cell, ordered by dependency (deps first).
+    How consecutive packages (in dependency order) are grouped into notebook code cells.
 
-    We also tag cells with metadata so later steps can distinguish between:
-      - package compilation cells
-      - view rendering cells (%view ...)
+    mode is "none" (one cell per package), "count" (up to size packages per cell), "bytes"
+    (packages are added to a cell until its source would exceed size bytes; a larger
+    package gets a cell of its own) or "generation" (one cell per topological generation).
+    Fewer cells mean fewer execute_request round-trips to the kernel; each batched cell
+    still lists its packages and their line ranges in metadata, so errors can be attributed.
     """
-    order = topological_packages(G, dependencies_first=True)
-    order = [p for p in order if p in package_text]  # only packages we have text for
 
-    cells: List[dict] = []
+    mode: str = "none"
+    size: int = 0
+
+    @classmethod
+    def parse(cls, spec: str) -> "CellBatching":
+        """Parse none | generation | count:N (or just N) | bytes:N[k|m]."""
+        spec = spec.strip().lower()
+        if spec in ("none", "generation"):
+            return cls(spec)
+        mode, _, value = spec.rpartition(":")
+        mode = mode or "count"
+        m = re.fullmatch(r"(\d+)([km]?)", value)
+        if mode not in ("count", "bytes") or m is None or int(m.group(1)) < 1:
+            raise ValueError(
+                f"Invalid cell batching {spec!r}: expected none, generation, count:N or bytes:N"
+            )
+        size = int(m.group(1)) * {"": 1, "k": 1024, "m": 1024 * 1024}[m.group(2)]
+        return cls(mode, size)
+
+
+def _source_size(package_text: Mapping[str, str], name: str) -> int:
+    if isinstance(package_text, PackageIndex):
+        record = package_text.record(name)
+        return record.end - record.start
+    return len(package_text[name].encode("utf-8"))
+
 
-    # ---- Package cells (code) ----
+def _package_batches(
+    G: GraphLike, order: List[str], package_text: Mapping[str, str], batching: CellBatching
+) -> Iterator[List[str]]:
+    if batching.mode == "generation":
+        wanted = set(order)
+        for generation in GraphAnalysis.of(G).generations:
+            batch = [p for p in generation if p in wanted]
+            if batch:
+                yield batch
+        return
+    if batching.mode not in ("count", "bytes"):
+        yield from ([p] for p in order)
+        return
+
+    batch: List[str] = []
+    used = 0
     for pkg in order:
-        body = package_text[pkg].rstrip() + "\n"
-        cells.append(
-            {
-                "cell_type": "code",
-                "execution_count": None,
-                "id": uuid.uuid4().hex,
-                "metadata": {
-                    "windseeker": {
-                        "kind": "package",
-                        "name": pkg,
-                    }
-                },
-                "outputs": [],
-                "source": body.splitlines(True),
-            }
-        )
+        cost = 1 if batching.mode == "count" else _source_size(package_text, pkg)
+        if batch and used + cost > batching.size:
+            yield batch
+            batch, used = [], 0
+        batch.append(pkg)
+        used += cost
+    if batch:
+        yield batch
 
-    # ---- View cells (markdown + code) ----
-    views = views or []
-    for v in views:
-        # Title cell
-        cells.append(
-            {
-                "cell_type": "markdown",
-                "execution_count": None,
-                "id": uuid.uuid4().hex,
-                "metadata": {
-                    "windseeker": {
-                        "kind": "view_title",
-                        "name": v,
-                    }
-                },
-                "outputs": [],
-                "source": [f"# {v}\n"],
-            }
-        )
-
-        # SysML magic cell
-        cells.append(
-            {
-                "cell_type": "code",
-                "execution_count": None,
-                "id": uuid.uuid4().hex,
-                "metadata": {
-                    "windseeker": {
-                        "kind": "view",
-                        "name": v,
-                    }
-                },
-                "outputs": [],
-                "source": [f"%view {v}\n"],
-            }
-        )
 
-    nb = {
-        "cells": cells,
+def package_content_hashes(package_text: Mapping[str, str]) -> Dict[str, str]:
+    """Source hash per package (see packages.content_hash)."""
+    if isinstance(package_text, PackageIndex):
+        # already hashed while scanning; no need to read the sources back
+        return {r.name: r.content_hash for r in package_text.records()}
+    return {name: content_hash(text.encode("utf-8")) for name, text in package_text.items()}
+
+
+def _cell(
+    cell_type: str, kind: str, name: str, source: List[str], digest: str, **extra: Any
+) -> dict:
+    return {
+        "cell_type": cell_type,
+        "execution_count": None,
+        # same input, same id: rebuilt notebooks diff cleanly and unchanged cells are
+        # recognizable by id alone
+        "id": content_hash(f"{kind}\0{name}\0{digest}".encode("utf-8"))[:32],
         "metadata": {
-            "kernelspec": {"display_name": "SysML", "language": "sysml", "name": "sysml"},
-            "language_info": {
-                "codemirror_mode": "sysml",
-                "file_extension": ".sysml",
-                "mimetype": "text/x-sysml",
-                "name": "SysML",
-                "pygments_lexer": "java",
-                "version": "1.0.0",
-            },
+            "windseeker": {
+                "kind": kind,
+                "name": name,
+                "content_hash": digest,
+                **extra,
+            }
         },
-        "nbformat": 4,
-        "nbformat_minor": 5,
+        "outputs": [],
+        "source": source,
     }
 
-    Path(out_path).write_text(json.dumps(nb, indent=2), encoding="utf-8")
+
+def iter_package_cells(
+    G: GraphLike,
+    order: List[str],
+    package_text: Mapping[str, str],
+    *,
+    batching: CellBatching | None = None,
+    own_hashes: Mapping[str, str] | None = None,
+) -> Iterator[dict]:
+    """Code cells loading the packages in order (dependencies first), grouped per batching."""
+    own = package_content_hashes(package_text) if own_hashes is None else own_hashes
+    for batch in _package_batches(G, order, package_text, batching or CellBatching()):
+        if len(batch) == 1:
+            pkg = batch[0]
+            body = package_text[pkg].rstrip() + "\n"
+            yield _cell("code", "package", pkg, body.splitlines(True), own[pkg])
+            continue
+
+        source: List[str] = []
+        members: List[Dict[str, Any]] = []
+        for pkg in batch:
+            lines = (package_text[pkg].rstrip() + "\n").splitlines(True)
+            members.append(
+                {
+                    "name": pkg,
+                    "content_hash": own[pkg],
+                    "first_line": len(source) + 1,
+                    "line_count": len(lines),
+                }
+            )
+            source.extend(lines)
+        digest = content_hash("\n".join(own[p] for p in batch).encode("utf-8"))
+        name = f"{batch[0]}..{batch[-1]}"
+        yield _cell("code", "package_batch", name, source, digest, packages=members)
+
+
+def iter_view_cells(
+    G: GraphLike,
+    package_text: Mapping[str, str],
+    views: List[str],
+    *,
+    own_hashes: Mapping[str, str] | None = None,
+) -> Iterator[dict]:
+    """A markdown title cell and a %view code cell per view, in the given order."""
+    if not views:
+        return
+    own = package_content_hashes(package_text) if own_hashes is None else own_hashes
+    # a view's output depends on its owning package and everything that package imports
+    closure = closure_hashes(G, own)
+    for v in views:
+        owner = v.split("::", 1)[0]
+        digest = content_hash(f"{v}\0{closure.get(owner, '')}".encode("utf-8"))
+        yield _cell("markdown", "view_title", v, [f"# {v}\n"], digest)
+        yield _cell("code", "view", v, [f"%view {v}\n"], digest)
+
+
+def _write_notebook_json(f: IO[str], cells: Iterable[dict], indent: int | None) -> None:
+    """
+    Stream {"cells": [...], "metadata": ..., "nbformat": 4, "nbformat_minor": 5} to f one
+    cell at a time. With an indent the output is identical to json.dumps(nb, indent=indent);
+    indent=None writes compact JSON.
+    """
+    rest = {"metadata": _NOTEBOOK_METADATA, "nbformat": 4, "nbformat_minor": 5}
+    if indent is None:
+        f.write('{"cells":[')
+        for i, cell in enumerate(cells):
+            f.write(("," if i else "") + json.dumps(cell, separators=(",", ":")))
+        f.write("]," + json.dumps(rest, separators=(",", ":"))[1:])
+        return
+
+    pad = " " * indent
+    f.write("{\n" + pad + '"cells": [')
+    empty = True
+    for cell in cells:
+        # JSON strings never contain raw newlines, so re-indenting line starts is safe
+        text = json.dumps(cell, indent=indent).replace("\n", "\n" + pad * 2)
+        f.write(("\n" if empty else ",\n") + pad * 2 + text)
+        empty = False
+    f.write("]" if empty else "\n" + pad + "]")
+    f.write(",\n" + json.dumps(rest, indent=indent)[2:])
+
+
+def iter_notebook_cells(
+    G: GraphLike,
+    package_text: Mapping[str, str],
+    *,
+    views: List[str] | None = None,
+    packages: Collection[str] | None = None,
+    batching: CellBatching | None = None,
+) -> Iterator[dict]:
+    """
+    The cells of write_notebook_in_dependency_order as plain dicts, generated one at a time
+    (e.g. to feed them straight to a kernel without a notebook file).
+    """
+    order = topological_packages(G, dependencies_first=True)
+    order = [p for p in order if p in package_text]  # only packages we have text for
+    if packages is not None:
+        order = [p for p in order if p in packages]
+    own = package_content_hashes(package_text)
+    yield from iter_package_cells(G, order, package_text, batching=batching, own_hashes=own)
+    yield from iter_view_cells(G, package_text, views or [], own_hashes=own)
+
+
+def write_notebook_cells(cells: Iterable[dict], out_path: str, *, indent: int | None = 2) -> None:
+    """Write cells (e.g. from iter_notebook_cells, possibly executed) as a SysML notebook."""
+    with open(out_path, "w", encoding="utf-8") as f:
+        _write_notebook_json(f, cells, indent)
+
+
+def write_notebook_in_dependency_order(
+    G: GraphLike,
+    package_text: Mapping[str, str],
+    *,
+    views: List[str] | None = None,
+    packages: Collection[str] | None = None,
+    out_path: str = "packages_in_dependency_order.ipynb",
+    indent: int | None = 2,
+    batching: CellBatching | None = None,
+) -> None:
+    """
+    Write a Jupyter notebook where the entire notebook uses the SysML kernel.
+    Each top-level package becomes one code cell (or part of one, see batching), ordered by
+    dependency (deps first).
+    Pass a GraphAnalysis as G to reuse an already computed order. If packages is given, only
+    those packages get cells (e.g. the dependency closure of the selected views).
+
+    Cells are streamed to out_path one at a time, so only one package body is in memory at
+    once; indent=None writes compact JSON (smaller and faster for very large models).
+    batching groups consecutive packages into shared cells (see CellBatching).
+
+    We also tag cells with metadata so later steps can distinguish between:
+      - package compilation cells
+      - view rendering cells (%view ...)
+    and record windseeker.content_hash: the package's source hash for package cells, and for
+    view cells a hash of the view name and its owning package's dependency closure (see
+    closure_hashes). Cell ids are derived from it, so identical input gives an identical
+    notebook.
+    """
+    cells = iter_notebook_cells(G, package_text, views=views, packages=packages, batching=batching)
+    write_notebook_cells(cells, out_path, indent=indent)
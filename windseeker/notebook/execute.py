@@ -4,9 +4,7 @@ import re
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
-
-import nbformat
+from typing import Any, Dict, Iterable, List, Tuple
 
 
 ERROR_PATTERNS = [
@@ -16,6 +14,10 @@ ERROR_PATTERNS = [
 ]
 
 
+# Kernel diagnostics give the position within the cell, e.g. "(3.sysml line : 12 column : 5)"
+_LINE_RE = re.compile(r"\bline\s*:?\s*(\d+)", re.IGNORECASE)
+
+
 def _cell_source_as_str(cell: Dict[str, Any]) -> str:
     src = cell.get("source", "")
     if isinstance(src, list):
@@ -75,6 +77,8 @@ def execute_notebook(
     Tries nbclient first. If not available, falls back to:
       jupyter nbconvert --execute
     """
+    import nbformat
+
     try:
         from nbclient import NotebookClient  # type: ignore
 
@@ -119,19 +123,50 @@ def execute_notebook(
         )
 
 
+def _packages_for_issue(cell: Dict[str, Any], text: str) -> List[str]:
+    """
+    Package(s) a package-cell issue belongs to. For a batched cell the error's line number
+    picks the package; without one every package in the batch is a candidate.
+    """
+    wind = _windseeker_meta(cell)
+    kind = wind.get("kind")
+    if kind == "package":
+        name = wind.get("name")
+        return [name] if isinstance(name, str) else []
+    if kind != "package_batch":
+        return []
+
+    members = [m for m in wind.get("packages", []) or [] if isinstance(m, dict)]
+    match = _LINE_RE.search(text)
+    if match:
+        line = int(match.group(1))
+        for m in members:
+            first = int(m.get("first_line", 0))
+            if first <= line < first + int(m.get("line_count", 0)):
+                return [str(m.get("name"))]
+    return [str(m.get("name")) for m in members]
+
+
 def collect_notebook_issues(nb) -> List[Dict[str, Any]]:
+    """Collect issues from an executed notebook (see collect_cell_issues)."""
+    return collect_cell_issues(nb.cells)
+
+
+def collect_cell_issues(cells: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
-    Collect issues from a notebook execution.
+    Collect issues from executed cells.
     Handles both:
       - output_type == "error"
       - stderr stream text like "ERROR:..."
     Adds:
       - is_view: bool
       - view_name: Optional[str]
+      - packages: List[str] (package cells: the package, or for a batched cell the one the
+        error's line number points at, else every package in the batch)
     """
     issues: List[Dict[str, Any]] = []
 
-    for idx, cell in enumerate(nb.cells):
+    for idx, cell in enumerate(cells):
         if cell.get("cell_type") != "code":
             continue
 
@@ -142,15 +177,18 @@ def collect_notebook_issues(nb) -> List[Dict[str, Any]]:
             ot = out.get("output_type")
 
             if ot == "error":
+                traceback = out.get("traceback", [])
+                text = "\n".join([str(out.get("evalue", ""))] + [str(t) for t in traceback])
                 issues.append(
                     {
                         "cell_index": idx,
                         "type": "error_output",
                         "ename": out.get("ename", ""),
                         "evalue": out.get("evalue", ""),
-                        "traceback": out.get("traceback", []),
+                        "traceback": traceback,
                         "is_view": is_view,
                         "view_name": view_name,
+                        "packages": [] if is_view else _packages_for_issue(cell, text),
                     }
                 )
                 continue
@@ -165,6 +203,7 @@ def collect_notebook_issues(nb) -> List[Dict[str, Any]]:
                             "text": text,
                             "is_view": is_view,
                             "view_name": view_name,
+                            "packages": [] if is_view else _packages_for_issue(cell, text),
                         }
                     )
 
@@ -198,6 +237,13 @@ def format_notebook_issues(issues: List[Dict[str, Any]], max_show: int = 50) ->
         if issue.get("is_view"):
             vn = issue.get("view_name") or "UNKNOWN_VIEW"
             prefix = f"[VIEW {vn}] "
+        else:
+            packages = issue.get("packages") or []
+            if len(packages) == 1:
+                prefix = f"[PACKAGE {packages[0]}] "
+            elif packages:
+                shown = ", ".join(packages[:5]) + (", ..." if len(packages) > 5 else "")
+                prefix = f"[ONE OF {len(packages)} PACKAGES: {shown}] "
 
         if t == "error_output":
             ename = issue.get("ename", "")
@@ -225,11 +271,17 @@ def execute_and_fail_on_notebook_errors(
       - By default, do NOT fail if only %view cells error (warn instead)
       - If fail_on_view_errors=True, view errors become fatal
     """
+    import nbformat
+
     execute_notebook(notebook_path, executed_out_path, timeout_sec=timeout_sec)
 
     nb = nbformat.read(executed_out_path, as_version=4)
-    issues = collect_notebook_issues(nb)
+    _fail_or_warn_on_issues(collect_notebook_issues(nb), fail_on_view_errors=fail_on_view_errors)
 
+    print(f"Notebook executed: {executed_out_path}")
+
+
+def _fail_or_warn_on_issues(issues: List[Dict[str, Any]], *, fail_on_view_errors: bool) -> None:
     fatal, view = split_notebook_issues(issues)
 
     if fatal:
@@ -244,4 +296,53 @@ def execute_and_fail_on_notebook_errors(
             "Continuing because fail_on_view_errors=False.\n" + format_notebook_issues(view)
         )
 
-    print(f"Notebook executed: {executed_out_path}")
+
+def execute_cells_and_fail_on_errors(
+    cells: Iterable[Dict[str, Any]],
+    *,
+    executed_out_path: str | None = None,
+    indent: int | None = 2,
+    kernel_name: str = "sysml",
+    timeout_sec: int = 600,
+    fail_on_view_errors: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    In-process counterpart of execute_and_fail_on_notebook_errors: feed cells (e.g. from
+    iter_notebook_cells) straight to a kernel via jupyter_client, keep the outputs in memory
+    and apply the same error policy. The executed cells are returned for view extraction;
+    the executed notebook is only written if executed_out_path is given.
+
+    timeout_sec limits each cell.
+    """
+    from windseeker.notebook.kernel import KernelSession
+
+    with KernelSession(kernel_name, timeout_sec=timeout_sec) as kernel:
+        executed = [kernel.run_cell(cell) for cell in cells]
+
+    fail_on_executed_cell_errors(
+        executed,
+        executed_out_path=executed_out_path,
+        indent=indent,
+        fail_on_view_errors=fail_on_view_errors,
+    )
+    print(f"Executed {len(executed)} cell(s) in kernel {kernel_name!r}")
+    return executed
+
+
+def fail_on_executed_cell_errors(
+    executed: List[Dict[str, Any]],
+    *,
+    executed_out_path: str | None = None,
+    indent: int | None = 2,
+    fail_on_view_errors: bool = False,
+) -> None:
+    """
+    Optionally write executed cells as a notebook, then apply the error policy of
+    execute_and_fail_on_notebook_errors to them.
+    """
+    if executed_out_path:
+        from windseeker.notebook.build import write_notebook_cells
+
+        write_notebook_cells(executed, executed_out_path, indent=indent)
+
+    _fail_or_warn_on_issues(collect_cell_issues(executed), fail_on_view_errors=fail_on_view_errors)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import queue
+import time
+from typing import Any, Dict, List
+
+
+class KernelSession:
+    """
+    One kernel driven directly through jupyter_client.
+
+    Sources go in, nbformat-style output dicts come back; no notebook file is written or
+    read. Use as a context manager so the kernel is always shut down.
+    """
+
+    def __init__(
+        self,
+        kernel_name: str = "sysml",
+        *,
+        timeout_sec: int = 600,
+        startup_timeout_sec: int = 60,
+    ) -> None:
+        from jupyter_client.manager import start_new_kernel
+
+        self.kernel_name = kernel_name
+        self.timeout_sec = timeout_sec
+        self.km, self.kc = start_new_kernel(
+            kernel_name=kernel_name, startup_timeout=startup_timeout_sec
+        )
+
+    def __enter__(self) -> "KernelSession":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.kc.stop_channels()
+        self.km.shutdown_kernel(now=True)
+
+    def execute(self, source: str) -> Dict[str, Any]:
+        """
+        Run source and wait until the kernel is idle again.
+
+        Returns {"outputs": [...], "execution_count": n}; outputs are nbformat v4 output
+        dicts, exactly what nbclient would store in the cell. Raises TimeoutError if the
+        kernel does not finish within timeout_sec.
+        """
+        from nbformat.v4 import output_from_msg
+
+        msg_id = self.kc.execute(source, store_history=True, allow_stdin=False)
+        deadline = time.monotonic() + self.timeout_sec
+        outputs: List[Dict[str, Any]] = []
+        while True:
+            msg = self._next(self.kc.get_iopub_msg, deadline)
+            if msg.get("parent_header", {}).get("msg_id") != msg_id:
+                continue
+            msg_type = msg["msg_type"]
+            if msg_type == "status" and msg["content"].get("execution_state") == "idle":
+                break
+            if msg_type == "clear_output":
+                outputs.clear()
+            elif msg_type in ("stream", "display_data", "execute_result", "error"):
+                outputs.append(output_from_msg(msg))
+
+        # drain the matching execute_reply so the shell channel does not back up
+        while True:
+            reply = self._next(self.kc.get_shell_msg, deadline)
+            if reply.get("parent_header", {}).get("msg_id") == msg_id:
+                break
+        return {"outputs": outputs, "execution_count": reply["content"].get("execution_count")}
+
+    def _next(self, get, deadline: float) -> Dict[str, Any]:
+        remaining = deadline - time.monotonic()
+        try:
+            if remaining <= 0:
+                raise queue.Empty
+            return get(timeout=remaining)
+        except queue.Empty:
+            raise TimeoutError(
+                f"Kernel {self.kernel_name!r} did not finish within {self.timeout_sec}s"
+            ) from None
+
+    def run_cell(self, cell: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a code cell dict in place (markdown cells are left alone) and return it."""
+        if cell.get("cell_type") == "code":
+            src = cell.get("source", "")
+            result = self.execute("".join(src) if isinstance(src, list) else str(src))
+            cell["outputs"] = result["outputs"]
+            cell["execution_count"] = result["execution_count"]
+        return cell
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Collection, Deque, Dict, List, Mapping, Optional, Set, Tuple
+
+from windseeker.compact import CompactImportGraph
+from windseeker.graph import GraphAnalysis, GraphLike, topological_packages
+from windseeker.notebook.build import (
+    CellBatching,
+    iter_package_cells,
+    iter_view_cells,
+    package_content_hashes,
+)
+from windseeker.notebook.kernel import KernelSession
+
+
+class _WorkQueues:
+    """
+    One deque of tasks per kernel. A kernel takes from the front of its own deque and, once
+    that is empty, steals from the back of the fullest other one.
+    """
+
+    def __init__(self, queues: List[Deque[int]]) -> None:
+        self._queues = queues
+        self._lock = threading.Lock()
+
+    def take(self, worker: int) -> Optional[int]:
+        with self._lock:
+            own = self._queues[worker]
+            if own:
+                return own.popleft()
+            victim = max(self._queues, key=len)
+            return victim.pop() if victim else None
+
+
+def _assign(tasks: List[Tuple[str, Set[int]]], kernels: int) -> List[Deque[int]]:
+    # keep tasks sharing an owner package together (they need the same packages loaded) and
+    # hand the largest groups out first, always to the kernel with the least work so far
+    groups: Dict[str, List[int]] = {}
+    for i, (owner, _) in enumerate(tasks):
+        groups.setdefault(owner, []).append(i)
+    queues: List[Deque[int]] = [deque() for _ in range(kernels)]
+    for members in sorted(groups.values(), key=len, reverse=True):
+        min(queues, key=len).extend(members)
+    return queues
+
+
+def _direct_imports(G: GraphLike, name: str) -> List[str]:
+    if isinstance(G, CompactImportGraph):
+        return G.imports_of(name) if name in G else []
+    g = G.graph if isinstance(G, GraphAnalysis) else G
+    return list(g.successors(name)) if name in g else []
+
+
+def execute_in_kernel_pool(
+    G: GraphLike,
+    package_text: Mapping[str, str],
+    views: List[str],
+    *,
+    kernels: int,
+    packages: Collection[str] | None = None,
+    batching: CellBatching | None = None,
+    kernel_name: str = "sysml",
+    timeout_sec: int = 600,
+) -> List[Dict[str, Any]]:
+    """
+    Render views on a pool of kernels instead of one.
+
+    The package cells are built once, exactly as for a single kernel (dependency order,
+    grouped per batching), so the notebook does not depend on how work was scheduled. Each
+    view is a task that needs the cells holding its owning package's dependency closure
+    (with batching, plus the dependencies of everything batched alongside). A kernel runs
+    only the cells its tasks need that it has not run yet, in notebook order, then the
+    %view cell. Tasks start grouped by owner package and are rebalanced by work stealing.
+    Packages that no view needs are compiled as one extra task, so their errors are still
+    reported.
+
+    Returns executed cells in notebook order: every package cell, with the outputs of the
+    first kernel that ran it, then each view's title and %view cell in the order of views.
+    """
+    order = topological_packages(G, dependencies_first=True)
+    order = [p for p in order if p in package_text and (packages is None or p in packages)]
+    own = package_content_hashes(package_text)
+    package_cells = list(
+        iter_package_cells(G, order, package_text, batching=batching, own_hashes=own)
+    )
+    view_cells = list(iter_view_cells(G, package_text, views, own_hashes=own))
+
+    cell_of: Dict[str, int] = {}
+    for c, cell in enumerate(package_cells):
+        meta = cell["metadata"]["windseeker"]
+        for member in meta.get("packages") or [{"name": meta["name"]}]:
+            cell_of[member["name"]] = c
+    # cells are in dependency order, so every cell only needs earlier ones
+    cell_deps: List[Set[int]] = [set() for _ in package_cells]
+    for pkg, c in cell_of.items():
+        cell_deps[c].update(cell_of[d] for d in _direct_imports(G, pkg) if d in cell_of)
+    for c, deps in enumerate(cell_deps):
+        deps.discard(c)
+
+    def cells_needed(roots: Collection[str]) -> Set[int]:
+        needed: Set[int] = set()
+        stack = [cell_of[p] for p in roots if p in cell_of]
+        while stack:
+            c = stack.pop()
+            if c not in needed:
+                needed.add(c)
+                stack.extend(cell_deps[c])
+        return needed
+
+    closures: Dict[str, Set[int]] = {}
+    tasks: List[Tuple[str, Set[int]]] = []
+    for v in views:
+        owner = v.split("::", 1)[0]
+        if owner not in closures:
+            closures[owner] = cells_needed([owner])
+        tasks.append((owner, closures[owner]))
+    needed = set().union(*closures.values()) if closures else set()
+    rest = [c for c in range(len(package_cells)) if c not in needed]
+    if rest:
+        tasks.append(("", cells_needed([p for p, c in cell_of.items() if c in rest])))
+
+    kernels = max(1, min(kernels, len(tasks)))
+    work = _WorkQueues(_assign(tasks, kernels))
+    lock = threading.Lock()
+    done: Set[int] = set()  # package cells whose outputs have been recorded
+    errors: List[BaseException] = []
+
+    def worker(w: int) -> None:
+        try:
+            task = work.take(w)
+            if task is None:
+                return
+            loaded: Set[int] = set()
+            with KernelSession(kernel_name, timeout_sec=timeout_sec) as kernel:
+                while task is not None and not errors:
+                    _, need = tasks[task]
+                    # loaded is always dependency-closed, so the missing cells can run in
+                    # notebook order
+                    for c in sorted(need - loaded):
+                        ran = kernel.run_cell(dict(package_cells[c]))
+                        with lock:
+                            if c not in done:
+                                done.add(c)
+                                package_cells[c] = ran
+                    loaded |= need
+                    if task < len(views):
+                        kernel.run_cell(view_cells[2 * task + 1])
+                    task = work.take(w)
+        except BaseException as e:  # re-raised in the calling thread
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(w,), daemon=True) for w in range(kernels)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return package_cells + view_cells
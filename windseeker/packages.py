@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+
+def content_hash(data: bytes) -> str:
+    """Hash of a package's source bytes (used to detect edits and, later, unchanged cells)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass(frozen=True)
+class PackageRecord:
+    """
+    Compact description of one top-level package: where its text lives, not the text.
+
+    The declaration text is bytes [start:end] of the UTF-8 source file at path and is only
+    read (and decoded) when read_text() is called. For models read from an archive, path is
+    the archive and member the source file inside it.
+    """
+
+    name: str
+    path: str
+    start: int
+    end: int
+    content_hash: str
+    imports: Tuple[str, ...] = ()
+    views: Tuple[str, ...] = ()
+    member: Optional[str] = None
+
+    @property
+    def source(self) -> str:
+        """Human-readable location of the defining file."""
+        return self.path if self.member is None else f"{self.path}!{self.member}"
+
+    def read_bytes(self) -> bytes:
+        """Read the package's source bytes, failing if they changed since the scan."""
+        if self.member is not None:
+            from windseeker.archive import read_archive_member
+
+            data = read_archive_member(self.path, self.member, self.start, self.end)
+        else:
+            with open(self.path, "rb") as f:
+                f.seek(self.start)
+                data = f.read(self.end - self.start)
+        if content_hash(data) != self.content_hash:
+            raise RuntimeError(
+                f"Package '{self.name}' changed in {self.source} since it was scanned; rescan."
+            )
+        return data
+
+    def read_text(self) -> str:
+        """Materialize the package declaration text."""
+        return self.read_bytes().decode("utf-8", errors="replace")
+
+
+class PackageIndex(Mapping[str, str]):
+    """
+    Scan result: top_level_package_name -> full package declaration text.
+
+    Behaves like the plain dict scan_folder used to return, but holds PackageRecords and
+    only reads a package's text from its source file when it is looked up, so graph-only
+    workflows never keep the model text in memory. The imports and views parsed at scan
+    time are available without touching the text.
+    """
+
+    def __init__(self) -> None:
+        self._records: Dict[str, PackageRecord] = {}
+
+    def add(self, record: PackageRecord) -> bool:
+        """Add a package unless one with the same name exists (first wins). Returns True if added."""
+        if record.name in self._records:
+            return False
+        self._records[record.name] = record
+        return True
+
+    def record(self, name: str) -> PackageRecord:
+        """The PackageRecord for a package (no text is read)."""
+        return self._records[name]
+
+    def records(self) -> List[PackageRecord]:
+        """All PackageRecords in scan order."""
+        return list(self._records.values())
+
+    def imports_of(self, name: str) -> List[str]:
+        """Imported TOP-LEVEL package names of a package (see parse_imports_from_package_text)."""
+        return list(self._records[name].imports)
+
+    def views_of(self, name: str) -> List[str]:
+        """Fully-qualified view names declared inside a package."""
+        return list(self._records[name].views)
+
+    def __getitem__(self, name: str) -> str:
+        return self._records[name].read_text()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __repr__(self) -> str:
+        return f"PackageIndex({list(self._records)!r})"
@@ -1,67 +1,130 @@
 from __future__ import annotations
 
+import mmap
 import re
-from typing import Dict, List, Tuple
-
-# Matches imports anywhere in a line (so "package A { import B; }" works),
-# but ignores lines that start with // (after whitespace).
-IMPORT_RE = re.compile(
-    r"""
-    ^(?!\s*//)                 # line must NOT start with optional whitespace then //
-    .*?                        # allow anything before 'import' (e.g., "package A {")
-    \bimport\b                 # whole word 'import' (won't match 'important')
-    \s+                        # at least one space
-    (                          # capture the target
-        '(?:[^'\\]|\\.)*'      # single-quoted string
-        |
-        [A-Za-z_][\w.:/-]*     # bare token (e.g. B::)
-    )
-    """,
-    re.VERBOSE,
+from dataclasses import dataclass, field
+from typing import Any, List, Mapping, NamedTuple, Optional, Pattern, Tuple, Union
+
+from windseeker.packages import PackageIndex
+
+# One name segment: a single-quoted unrestricted name or a bare identifier.
+_SEGMENT = r"'(?:[^'\\]|\\.)*'|[^\W\d]\w*"
+
+# Byte-level variant: keywords and punctuation are ASCII, and any non-ASCII byte is treated
+# as part of an identifier so UTF-8 names survive without decoding the whole file.
+_SEGMENT_BYTES = r"'(?:[^'\\]|\\.)*'|[A-Za-z_\x80-\xff][\w\x80-\xff]*"
+
+# Single tokenizer used for the one-pass scan. Whitespace and any punctuation that is not
+# listed here (':', '=', '#', '@', digits, ...) is skipped implicitly by finditer().
+_TOKEN_PATTERN = r"""
+    (?P<comment>//[^\n]*|/\*.*?(?:\*/|\Z))           # line or block comment
+    | (?P<string>"(?:[^"\\]|\\.)*")                  # string literal
+    | (?P<name>                                      # (qualified) name, e.g. A::'B c'::*
+        (?:SEGMENT)
+        (?:::(?!>)(?:SEGMENT|\*\*?))*             # '::>' is an operator, not a separator
+        (?:::(?!>))?
+      )
+    | (?P<punct>[{};])
+"""
+
+TOKEN_RE = re.compile(_TOKEN_PATTERN.replace("SEGMENT", _SEGMENT), re.VERBOSE | re.DOTALL)
+TOKEN_RE_BYTES = re.compile(
+    _TOKEN_PATTERN.replace("SEGMENT", _SEGMENT_BYTES).encode("ascii"), re.VERBOSE | re.DOTALL
 )
 
-PACKAGE_START_RE = re.compile(
-    r"""
-    (?m)^(?!\s*//)\s*          # not a line comment
-    (?:\w+\s+)*                # optional modifiers like 'library'
-    \bpackage\b\s+
-    (                          # capture package name
-        '(?:[^'\\]|\\.)*'
-        |
-        [A-Za-z_][\w.:/-]*
-    )
-    """,
-    re.VERBOSE,
+_NAME_SEGMENT_RE = re.compile(_SEGMENT)
+
+
+class _Syntax(NamedTuple):
+    """Token regex and literals for either str or bytes-like (bytes, mmap) sources."""
+
+    token_re: Pattern
+    trailing_semi_re: Pattern
+    package: Any
+    import_: Any
+    view: Any
+    doc: Any
+    comment: Any
+    block_comment: Any
+    all_: Any
+    lbrace: Any
+    rbrace: Any
+    newline: Any
+    quote: Any
+    colon: Any
+
+
+_STR_SYNTAX = _Syntax(
+    TOKEN_RE,
+    re.compile(r"[ \t\r\n]*;"),
+    "package",
+    "import",
+    "view",
+    "doc",
+    "comment",
+    "/*",
+    "all",
+    "{",
+    "}",
+    "\n",
+    "'",
+    ":",
 )
-
-VIEW_START_RE = re.compile(
-    r"""
-    ^(?!\s*//)\s*              # not a line comment
-    \bview\b\s+
-    (                          # capture view name
-        '(?:[^'\\]|\\.)*'
-        |
-        [A-Za-z_][\w.:/-]*
-    )
-    \s*\{                      # views are blocks
-    """,
-    re.VERBOSE,
+_BYTES_SYNTAX = _Syntax(
+    TOKEN_RE_BYTES,
+    re.compile(rb"[ \t\r\n]*;"),
+    b"package",
+    b"import",
+    b"view",
+    b"doc",
+    b"comment",
+    b"/*",
+    b"all",
+    b"{",
+    b"}",
+    b"\n",
+    b"'",
+    b":",
 )
 
-INNER_PACKAGE_OPEN_RE = re.compile(
-    r"""
-    ^(?!\s*//)\s*
-    (?:\w+\s+)*                # optional modifiers
-    \bpackage\b\s+
-    (                          # capture package name
-        '(?:[^'\\]|\\.)*'
-        |
-        [A-Za-z_][\w.:/-]*
-    )
-    \s*\{                      # only track nested packages that open a block
-    """,
-    re.VERBOSE,
-)
+
+@dataclass
+class PackageSpan:
+    """
+    A top-level package found by parse_sysml; its declaration text is source[start:end].
+
+    imports are normalized qualified import targets (A::B::* -> "A::B"), views are view names
+    qualified relative to this package (nested packages only, e.g. "Inner::MyView").
+    """
+
+    name: str
+    start: int
+    end: int = -1
+    imports: List[str] = field(default_factory=list)
+    views: List[str] = field(default_factory=list)
+
+    def top_level_imports(self) -> List[str]:
+        """Imported TOP-LEVEL package names, excluding self-imports."""
+        return _top_level_imports(self.name, self.imports)
+
+    def qualified_views(self, package_name: Optional[str] = None) -> List[str]:
+        """Fully-qualified view names, prefixed with package_name (default: this package)."""
+        prefix = package_name if package_name is not None else self.name
+        return [f"{prefix}::{v}" for v in self.views]
+
+
+@dataclass
+class SysmlOutline:
+    """
+    Everything parse_sysml found in one pass over a source text.
+
+    imports/views hold what appeared OUTSIDE any top-level package (e.g. when a fragment
+    without a package declaration is parsed).
+    """
+
+    packages: List[PackageSpan] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
+    views: List[str] = field(default_factory=list)
 
 
 def strip_line_comments(text: str) -> str:
@@ -69,20 +132,20 @@ def strip_line_comments(text: str) -> str:
     return "\n".join(line.split("//", 1)[0] for line in text.splitlines())
 
 
-def _normalize_qualified_name(name: str) -> str:
+def _qualified_name(token: Union[str, bytes]) -> str:
     """
-    Normalize captured names:
-    - strip surrounding single quotes already handled elsewhere
-    - remove a trailing '::' (common in patterns like A::*)
+    Normalize a captured (qualified) name token (bytes tokens are decoded as UTF-8):
+    - strip single quotes around each segment
+    - drop wildcard segments and a trailing '::' (A::B::* / A::** / A:: -> A / A::B)
     """
-    return re.sub(r"::\s*$", "", name)
-
-
-def _strip_quotes_if_needed(token: str) -> str:
-    """Remove surrounding single quotes if token is a single-quoted string; keep content as-is."""
-    if len(token) >= 2 and token[0] == "'" and token[-1] == "'":
-        return token[1:-1]
-    return token
+    if isinstance(token, bytes):
+        token = token.decode("utf-8", errors="replace")
+    segments = []
+    for seg in _NAME_SEGMENT_RE.findall(token):
+        if len(seg) >= 2 and seg[0] == "'" and seg[-1] == "'":
+            seg = seg[1:-1]
+        segments.append(seg)
+    return "::".join(segments)
 
 
 def _top_level_of_qualified_name(name: str) -> str:
@@ -90,94 +153,158 @@ def _top_level_of_qualified_name(name: str) -> str:
     return name.split("::", 1)[0]
 
 
-def _find_matching_brace(text: str, open_brace_index: int) -> int:
-    """Return index of matching '}' for the '{' at open_brace_index, or -1 if not found."""
-    depth = 0
-    i = open_brace_index
-    n = len(text)
-    while i < n:
-        ch = text[i]
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                return i
-        i += 1
-    return -1
-
-
-def _brace_depth_prefix(text: str) -> List[int]:
-    """
-    Return prefix brace depth at each character index.
-    depth[i] is the brace depth *before* processing text[i].
-    """
-    depth = [0] * (len(text) + 1)
-    d = 0
-    for i, ch in enumerate(text):
-        depth[i] = d
-        if ch == "{":
-            d += 1
-        elif ch == "}":
-            d = max(0, d - 1)
-    depth[len(text)] = d
-    return depth
+def _top_level_imports(pkg_name: str, imports: List[str]) -> List[str]:
+    result: List[str] = []
+    for imp_full in imports:
+        imp_top = _top_level_of_qualified_name(imp_full)
 
+        # ignore self-imports at top-level
+        if imp_top == pkg_name:
+            continue
 
-def extract_top_level_packages_with_text(text: str) -> List[Tuple[str, str]]:
-    """
-    Extract ONLY top-level packages and store their full declaration text.
-    Nested packages are left inside the parent's captured text and are NOT returned
-    as separate entries.
+        result.append(imp_top)
+    return result
+
+
+Source = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+
+
+def parse_sysml(text: Source) -> SysmlOutline:
     """
-    results: List[Tuple[str, str]] = []
-    depths = _brace_depth_prefix(text)
+    Single linear scan over SysML source text.
 
-    for m in PACKAGE_START_RE.finditer(text):
-        # Only accept packages that start at top-level brace depth
-        if depths[m.start()] != 0:
-            continue
+    Finds top-level packages (with their spans), nested package scopes, imports and views,
+    skipping // and /* */ comments, string literals and quoted names.
 
-        raw_name = m.group(1)
-        name = _normalize_qualified_name(_strip_quotes_if_needed(raw_name))
+    text may also be bytes-like (bytes, mmap, ...): it is then lexed as raw UTF-8 without
+    decoding, only captured names are decoded, and spans are byte offsets.
+    """
+    syn = _STR_SYNTAX if isinstance(text, str) else _BYTES_SYNTAX
+    outline = SysmlOutline()
+    n = len(text)
 
-        # Find token after name: ';' or '{'
-        j = m.end()
-        n = len(text)
-        while j < n and text[j].isspace():
-            j += 1
-        if j >= n:
+    # one entry per open '{': the package name it opens, or None for any other block
+    scopes: List[Optional[str]] = []
+    current: Optional[PackageSpan] = None  # top-level package whose body is open
+
+    stmt_start = -1  # offset of the first token of the current statement
+    stmt_plain = True  # statement so far consists of bare words only (e.g. "library")
+    stmt_annotation = False  # statement is a doc/comment annotation (ends with its /* */ body)
+    expect: Optional[str] = None  # package | package_body | import | view | view_body
+    decl_name = ""
+    decl_start = 0
+    decl_end = 0
+
+    def end_of_line(i: int) -> int:
+        nl = text.find(syn.newline, i)
+        return n if nl == -1 else nl
+
+    for m in syn.token_re.finditer(text):
+        kind = m.lastgroup
+        if kind == "comment":
+            # `doc /* ... */` and `comment ... /* ... */` have no ';': the body ends them
+            if stmt_annotation and m.group().startswith(syn.block_comment):
+                stmt_start = -1
+                stmt_plain = True
+                stmt_annotation = False
+                expect = None
             continue
 
-        if text[j] == ";":
-            end = j + 1
-            while end < n and text[end] != "\n":
-                end += 1
-            results.append((name, text[m.start() : end]))
+        tok = m.group()
+
+        if kind == "punct":
+            if tok == syn.lbrace:
+                opened = None
+                if expect == "package_body":
+                    opened = decl_name
+                    if not scopes:
+                        current = PackageSpan(decl_name, decl_start)
+                elif expect == "view_body":
+                    nested = [s for s in scopes if s is not None]
+                    if current is not None:
+                        nested = nested[1:]
+                    view = "::".join(nested + [decl_name])
+                    (current.views if current is not None else outline.views).append(view)
+                scopes.append(opened)
+
+            elif tok == syn.rbrace:
+                if scopes:
+                    scopes.pop()
+                    if not scopes and current is not None:
+                        end = m.end()
+                        # include trailing ';' if present
+                        semi = syn.trailing_semi_re.match(text, end)
+                        if semi:
+                            end = semi.end()
+                        current.end = end
+                        outline.packages.append(current)
+                        current = None
+
+            elif expect == "package_body" and not scopes:
+                outline.packages.append(PackageSpan(decl_name, decl_start, m.end()))
+
+            stmt_start = -1
+            stmt_plain = True
+            stmt_annotation = False
+            expect = None
+            continue
 
-        elif text[j] == "{":
-            close = _find_matching_brace(text, j)
-            if close == -1:
-                results.append((name, text[m.start() :]))
-                continue
-            end = close + 1
+        first = stmt_start < 0
+        if first:
+            stmt_start = m.start()
+            stmt_annotation = tok in (syn.doc, syn.comment)
 
-            # include trailing ';' if present
-            k = end
-            while k < n and text[k].isspace():
-                k += 1
-            if k < n and text[k] == ";":
-                end = k + 1
+        if kind == "string":
+            stmt_plain = False
+            expect = None
+            continue
 
-            results.append((name, text[m.start() : end]))
+        if expect == "import":
+            if tok != syn.all_:
+                target = _qualified_name(tok)
+                (current.imports if current is not None else outline.imports).append(target)
+                expect = None
+        elif expect == "package":
+            decl_name = _qualified_name(tok)
+            decl_end = m.end()
+            expect = "package_body"
+        elif expect == "view":
+            decl_name = _qualified_name(tok)
+            expect = "view_body"
+        elif expect == "package_body":
+            # neither '{' nor ';' after the name: take the rest of the line
+            if not scopes:
+                outline.packages.append(PackageSpan(decl_name, decl_start, end_of_line(decl_end)))
+            expect = None
+        elif expect == "view_body":
+            expect = None
+        elif tok == syn.package and stmt_plain:
+            expect = "package"
+            decl_start = stmt_start
+        elif tok == syn.import_:
+            expect = "import"
+        elif tok == syn.view and first:
+            expect = "view"
+
+        if stmt_plain and (syn.quote in tok or syn.colon in tok):
+            stmt_plain = False
+
+    if current is not None:
+        current.end = n
+        outline.packages.append(current)
+    elif expect == "package_body" and not scopes:
+        outline.packages.append(PackageSpan(decl_name, decl_start, end_of_line(decl_end)))
+
+    return outline
 
-        else:
-            end = j
-            while end < n and text[end] != "\n":
-                end += 1
-            results.append((name, text[m.start() : end]))
 
-    return results
+def extract_top_level_packages_with_text(text: str) -> List[Tuple[str, str]]:
+    """
+    Extract ONLY top-level packages and store their full declaration text.
+    Nested packages are left inside the parent's captured text and are NOT returned
+    as separate entries.
+    """
+    return [(p.name, text[p.start : p.end]) for p in parse_sysml(text).packages]
 
 
 def collect_views_from_top_level_package_text(
@@ -189,47 +316,25 @@ def collect_views_from_top_level_package_text(
     Example result:
       Flashlight_StarterModel::Views1::flashlightPartsTree
     """
-    clean_lines = [line.split("//", 1)[0] for line in package_full_text.splitlines()]
-
-    views: List[str] = []
-
-    depth = 0
-    # stack entries: (nested_package_name, enter_depth_after_open_brace)
-    stack: List[tuple[str, int]] = []
-
-    for raw_line in clean_lines:
-        line = raw_line
-
-        # pop stack if we've exited nested package blocks
-        while stack and depth < stack[-1][1]:
-            stack.pop()
-
-        # detect nested package openings: package X {
-        m_pkg = INNER_PACKAGE_OPEN_RE.search(line)
-        if m_pkg:
-            inner = _normalize_qualified_name(_strip_quotes_if_needed(m_pkg.group(1)))
-
-            # Skip the outermost package declaration if it appears inside its own text
-            if inner != package_name:
-                stack.append((inner, depth + 1))
-
-        # detect view openings: view Y {
-        m_view = VIEW_START_RE.search(line)
-        if m_view:
-            view_name = _normalize_qualified_name(_strip_quotes_if_needed(m_view.group(1)))
-            prefix = [package_name] + [p for p, _ in stack]
-            views.append("::".join(prefix + [view_name]))
-
-        depth += line.count("{") - line.count("}")
-
+    outline = parse_sysml(package_full_text)
+    views = [f"{package_name}::{v}" for v in outline.views]
+    for p in outline.packages:
+        views.extend(p.qualified_views(package_name))
     return views
 
 
-def collect_all_views(package_text: Dict[str, str]) -> List[str]:
-    """Collect all fully-qualified view names across all top-level packages."""
+def collect_all_views(package_text: Mapping[str, str]) -> List[str]:
+    """
+    Collect all fully-qualified view names across all top-level packages.
+
+    Views already parsed at scan time (PackageIndex) are reused.
+    """
     all_views: List[str] = []
-    for pkg, txt in package_text.items():
-        all_views.extend(collect_views_from_top_level_package_text(pkg, txt))
+    for pkg in package_text:
+        if isinstance(package_text, PackageIndex):
+            all_views.extend(package_text.views_of(pkg))
+        else:
+            all_views.extend(collect_views_from_top_level_package_text(pkg, package_text[pkg]))
 
     # de-dup while preserving order
     seen = set()
@@ -248,18 +353,8 @@ def parse_imports_from_package_text(
     """
     Return list of imported TOP-LEVEL package names (e.g. import A::B::C -> "A").
     """
-    imports: List[str] = []
-    for raw_line in pkg_full_text.splitlines():
-        line = raw_line.split("//", 1)[0]
-        m_imp = IMPORT_RE.search(line)
-        if not m_imp:
-            continue
-        imp_full = _normalize_qualified_name(_strip_quotes_if_needed(m_imp.group(1)))
-        imp_top = _top_level_of_qualified_name(imp_full)
-
-        # ignore self-imports at top-level
-        if imp_top == pkg_name:
-            continue
-
-        imports.append(imp_top)
-    return imports
+    outline = parse_sysml(pkg_full_text)
+    imports = list(outline.imports)
+    for p in outline.packages:
+        imports.extend(p.imports)
+    return _top_level_imports(pkg_name, imports)
@@ -1,45 +1,98 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set
-
-import networkx as nx
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Mapping, Optional, Sequence, Set
 
+from windseeker.cache import ParseCache
 from windseeker.graph import (
+    GraphAnalysis,
+    GraphLike,
     assert_acyclic_or_raise,
     assert_no_unresolved_imports_or_raise,
     build_import_graph_from_package_text,
+    dependency_closure,
     get_unresolved_imports,
     topological_packages,
 )
-from windseeker.notebook.build import write_notebook_in_dependency_order
-from windseeker.notebook.execute import execute_and_fail_on_notebook_errors
+from windseeker.impact import (
+    INDEX_FILE_NAME,
+    ReachabilityIndex,
+    import_fingerprint,
+    views_of_packages,
+)
+from windseeker.notebook.build import (
+    CellBatching,
+    iter_notebook_cells,
+    write_notebook_cells,
+    write_notebook_in_dependency_order,
+)
+from windseeker.notebook.execute import (
+    execute_and_fail_on_notebook_errors,
+    execute_cells_and_fail_on_errors,
+    fail_on_executed_cell_errors,
+)
+from windseeker.notebook.pool import execute_in_kernel_pool
 from windseeker.parsing import collect_all_views
-from windseeker.scan import scan_folder
-from windseeker.visualize import visualize_graph_to_file
-from windseeker.views.extract import extract_view_images_from_executed_notebook
+from windseeker.scan import iter_packages, scan_folder
+from windseeker.views.extract import (
+    extract_view_images_from_cells,
+    extract_view_images_from_executed_notebook,
+)
 from windseeker.views.render import SvgRenderLimits
 
+if TYPE_CHECKING:
+    import networkx as nx
+
 
 @dataclass(frozen=True)
 class PipelineResult:
-    package_text: Dict[str, str]
+    # Usually a PackageIndex: package text is read from the source files on lookup
+    package_text: Mapping[str, str]
     graph: nx.DiGraph
     topo_order: List[str]
     views: List[str]
     unresolved_imports: dict[str, set[str]]
     written_view_files: List[str]
+    cache_hits: int = 0
+    cache_misses: int = 0
+    analysis: Optional[GraphAnalysis] = None
+    # packages given notebook cells when views were selected (None = all packages)
+    notebook_packages: Optional[List[str]] = None
+
+
+# run_pipeline execution engines
+ENGINES = ("notebook", "kernel")
 
 
 def run_pipeline(
     *,
     folder: str,
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
     write_graph: bool = True,
     graph_png: str = "imports.png",
-    graph_layout: str = "kamada_kawai",
+    graph_layout: str = "auto",
+    # png|svg|dot|graphml|json|...; None = from the graph_png extension
+    graph_format: Optional[str] = None,
     sysml_out: str = "packages_in_dependency_order.sysml",
     notebook_out: str = "packages_in_dependency_order.ipynb",
+    # Write the notebook as compact (non-indented) JSON
+    compact_notebook: bool = False,
+    # Group package cells to cut kernel round-trips (default: one cell per package)
+    cell_batching: CellBatching | None = None,
     execute: bool = True,
+    # "notebook": execute the notebook file (nbclient / nbconvert); "kernel": feed cells
+    # straight to the kernel in-process and keep outputs in memory
+    engine: str = "notebook",
+    # With engine="kernel": also write notebook_out / executed_notebook_out
+    notebook_artifacts: bool = True,
+    # With engine="kernel": render views on this many kernels in parallel
+    kernels: int = 1,
     executed_notebook_out: str = "packages_in_dependency_order_executed.ipynb",
     export_views: bool = True,
     views_dir: str = "views",
@@ -53,58 +106,135 @@ def run_pipeline(
     # If True, view-cell errors become fatal (default False = warn only)
     fail_on_view_errors: bool = False,
     svg_limits: SvgRenderLimits | None = None,
+    # Only build/execute these views (exact names or fnmatch globs) and the packages they need
+    view_names: Optional[Sequence[str]] = None,
+    view_globs: Optional[Sequence[str]] = None,
 ) -> PipelineResult:
+    # reject bad options before anything is scanned or written
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown execution engine: {engine!r} (expected notebook or kernel)")
+    if kernels > 1 and engine != "kernel":
+        raise ValueError("kernels > 1 requires engine='kernel'")
+
     ignore_missing = ignore_missing or {"<root>"}
     svg_limits = svg_limits or SvgRenderLimits()
 
-    package_text = scan_folder(folder)
+    cache = ParseCache(cache_dir) if cache_dir else None
+    package_text = scan_folder(folder, jobs=jobs, cache=cache, include=include, exclude=exclude)
     G = build_import_graph_from_package_text(package_text)
+    # computed once, shared by every stage below
+    analysis = GraphAnalysis(G)
 
     # Fail fast on cycles
-    assert_acyclic_or_raise(G)
+    assert_acyclic_or_raise(analysis)
 
     # Missing imports: record + optionally raise (strict_missing)
-    assert_no_unresolved_imports_or_raise(G, ignore=ignore_missing, strict=strict_missing)
-    unresolved = get_unresolved_imports(G, ignore=ignore_missing)
+    assert_no_unresolved_imports_or_raise(analysis, ignore=ignore_missing, strict=strict_missing)
+    unresolved = get_unresolved_imports(analysis, ignore=ignore_missing)
 
     # Views (fully qualified)
     views = collect_all_views(package_text)
 
+    # Optional slice: selected views + the transitive import closure of their packages
+    notebook_packages: Optional[Set[str]] = None
+    if view_names or view_globs:
+        views = select_views(views, names=view_names, globs=view_globs)
+        owners = {v.split("::", 1)[0] for v in views}
+        # unresolved imports are graph nodes too, but have no text to put in the notebook
+        notebook_packages = dependency_closure(analysis, owners) & package_text.keys()
+
     # Optional graph output
     if write_graph:
-        visualize_graph_to_file(G, graph_png, layout=graph_layout)
+        from windseeker.visualize import visualize_graph_to_file
+
+        visualize_graph_to_file(analysis, graph_png, layout=graph_layout, fmt=graph_format)
 
     # Topological order (deps first)
-    order = topological_packages(G, dependencies_first=True)
+    order = topological_packages(analysis, dependencies_first=True)
 
     # Dependency ordered SysML concatenation
-    _write_sysml_in_dependency_order(G, package_text, out_path=sysml_out)
-
-    # Notebook build
-    write_notebook_in_dependency_order(G, package_text, views=views, out_path=notebook_out)
+    _write_sysml_in_dependency_order(analysis, package_text, out_path=sysml_out)
 
+    indent = None if compact_notebook else 2
     written_views: List[str] = []
+    extract_options = dict(
+        out_dir=views_dir,
+        write_svg=write_svg,
+        write_png=write_png,
+        write_jpg=write_jpg,
+        png_transparent_background=png_transparent,
+        png_background_color=png_bg,
+        svg_limits=svg_limits,
+    )
 
-    # Notebook execute + extract
-    if execute:
-        execute_and_fail_on_notebook_errors(
-            notebook_out,
-            executed_out_path=executed_notebook_out,
+    if execute and engine == "kernel" and kernels > 1:
+        # Kernel pool: each kernel loads only what its views need
+        if notebook_artifacts:
+            write_notebook_in_dependency_order(
+                analysis,
+                package_text,
+                views=views,
+                packages=notebook_packages,
+                out_path=notebook_out,
+                indent=indent,
+                batching=cell_batching,
+            )
+        executed = execute_in_kernel_pool(
+            analysis,
+            package_text,
+            views,
+            kernels=kernels,
+            packages=notebook_packages,
+            batching=cell_batching,
+        )
+        fail_on_executed_cell_errors(
+            executed,
+            executed_out_path=executed_notebook_out if notebook_artifacts else None,
+            indent=indent,
             fail_on_view_errors=fail_on_view_errors,
         )
-
         if export_views:
-            written_views = extract_view_images_from_executed_notebook(
-                executed_notebook_out,
-                out_dir=views_dir,
-                write_svg=write_svg,
-                write_png=write_png,
-                write_jpg=write_jpg,
-                png_transparent_background=png_transparent,
-                png_background_color=png_bg,
-                svg_limits=svg_limits,
+            written_views = extract_view_images_from_cells(executed, **extract_options)
+    elif execute and engine == "kernel":
+        # Notebook build + execute + extract without notebook file round-trips
+        cells = iter_notebook_cells(
+            analysis, package_text, views=views, packages=notebook_packages, batching=cell_batching
+        )
+        if notebook_artifacts:
+            cells = list(cells)
+            write_notebook_cells(cells, notebook_out, indent=indent)
+        executed = execute_cells_and_fail_on_errors(
+            cells,
+            executed_out_path=executed_notebook_out if notebook_artifacts else None,
+            indent=indent,
+            fail_on_view_errors=fail_on_view_errors,
+        )
+        if export_views:
+            written_views = extract_view_images_from_cells(executed, **extract_options)
+    else:
+        # Notebook build
+        write_notebook_in_dependency_order(
+            analysis,
+            package_text,
+            views=views,
+            packages=notebook_packages,
+            out_path=notebook_out,
+            indent=indent,
+            batching=cell_batching,
+        )
+
+        # Notebook execute + extract
+        if execute:
+            execute_and_fail_on_notebook_errors(
+                notebook_out,
+                executed_out_path=executed_notebook_out,
+                fail_on_view_errors=fail_on_view_errors,
             )
 
+            if export_views:
+                written_views = extract_view_images_from_executed_notebook(
+                    executed_notebook_out, **extract_options
+                )
     return PipelineResult(
         package_text=package_text,
         graph=G,
@@ -112,28 +242,118 @@ def run_pipeline(
         views=views,
         unresolved_imports=unresolved,
         written_view_files=written_views,
+        cache_hits=cache.hits if cache else 0,
+        cache_misses=cache.misses if cache else 0,
+        analysis=analysis,
+        notebook_packages=(
+            None if notebook_packages is None else [p for p in order if p in notebook_packages]
+        ),
     )
 
 
-def order_only(*, folder: str, dependencies_first: bool = True) -> List[str]:
-    package_text = scan_folder(folder)
-    G = build_import_graph_from_package_text(package_text)
-    assert_acyclic_or_raise(G)
+def select_views(
+    views: Sequence[str],
+    *,
+    names: Optional[Sequence[str]] = None,
+    globs: Optional[Sequence[str]] = None,
+) -> List[str]:
+    """
+    Views matching any exact name or fnmatch glob, in their original order.
+
+    Raises ValueError for an exact name that is not a known view; a glob that matches
+    nothing only warns.
+    """
+    known = set(views)
+    missing = [n for n in names or () if n not in known]
+    if missing:
+        raise ValueError(f"Unknown view(s): {', '.join(missing)}")
+    for g in globs or ():
+        if not any(fnmatchcase(v, g) for v in views):
+            print(f"Warning: --view-glob {g!r} matched no views")
+
+    wanted = set(names or ())
+    return [v for v in views if v in wanted or any(fnmatchcase(v, g) for g in globs or ())]
+
+
+def order_only(
+    *,
+    folder: str,
+    dependencies_first: bool = True,
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    backend: str = "networkx",
+) -> List[str]:
+    cache = ParseCache(cache_dir) if cache_dir else None
+    # no package text is needed here, so build the graph straight from the scan stream
+    records = iter_packages(folder, jobs=jobs, cache=cache, include=include, exclude=exclude)
+    G = build_import_graph_from_package_text(records, backend=backend)
+    # raises ImportCycleError on cycles
     return topological_packages(G, dependencies_first=dependencies_first)
 
 
+@dataclass(frozen=True)
+class ImpactResult:
+    changed: List[str]
+    packages: List[str]  # changed + transitive importers, dependencies first
+    views: List[str]
+
+
+def impact(
+    *,
+    folder: str,
+    targets: Sequence[str],
+    jobs: int = 1,
+    cache_dir: Optional[str] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+) -> ImpactResult:
+    """
+    Packages and views affected by editing targets (package names or .sysml file paths).
+
+    With a cache_dir the ReachabilityIndex is saved there and reused by later runs until
+    the scanned imports change, so only the (cached) scan and the query are repeated.
+
+    Raises ValueError for a target that is neither a scanned package nor a scanned file.
+    """
+    cache = ParseCache(cache_dir) if cache_dir else None
+    package_text = scan_folder(folder, jobs=jobs, cache=cache, include=include, exclude=exclude)
+
+    changed: List[str] = []
+    for target in targets:
+        if target in package_text:
+            changed.append(target)
+            continue
+        source = os.path.abspath(target)
+        defined = [r.name for r in package_text.records() if r.path == source]
+        if not defined:
+            raise ValueError(f"Not a scanned package or .sysml file: {target}")
+        changed.extend(defined)
+
+    fingerprint = import_fingerprint(package_text)
+    index_path = Path(cache_dir) / INDEX_FILE_NAME if cache_dir else None
+    index = ReachabilityIndex.load(index_path, fingerprint) if index_path else None
+    if index is None:
+        G = build_import_graph_from_package_text(package_text, backend="compact")
+        index = ReachabilityIndex(G)
+        if index_path:
+            index.save(index_path, fingerprint)
+    packages = index.affected_packages(changed)
+    views = views_of_packages(collect_all_views(package_text), packages)
+    return ImpactResult(changed=changed, packages=packages, views=views)
+
+
 def _write_sysml_in_dependency_order(
-    G: nx.DiGraph, package_text: Dict[str, str], *, out_path: str
+    G: GraphLike, package_text: Mapping[str, str], *, out_path: str
 ) -> None:
     order = topological_packages(G, dependencies_first=True)
     order = [p for p in order if p in package_text]
 
-    chunks: List[str] = []
-    for pkg in order:
-        chunks.append(f"// ===== PACKAGE: {pkg} =====")
-        chunks.append(package_text[pkg].rstrip())
-        chunks.append("")
-
-    from pathlib import Path
-
-    Path(out_path).write_text("\n".join(chunks), encoding="utf-8")
+    # one package at a time, so only a single package body is held in memory
+    with open(out_path, "w", encoding="utf-8") as f:
+        for i, pkg in enumerate(order):
+            if i:
+                f.write("\n")
+            f.write(f"// ===== PACKAGE: {pkg} =====\n")
+            f.write(package_text[pkg].rstrip() + "\n")
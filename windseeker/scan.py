@@ -1,36 +1,243 @@
 from __future__ import annotations
 
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Dict
+from typing import Deque, Iterator, List, Optional, Sequence, Tuple, Union
 
-from windseeker.parsing import strip_line_comments, extract_top_level_packages_with_text
+from windseeker.archive import is_archive, iter_archive_sysml
+from windseeker.cache import CachedPackage, ParseCache, file_digest
+from windseeker.ignore import DEFAULT_EXCLUDES, ScanRules, walk_sysml_files
+from windseeker.packages import PackageIndex, PackageRecord, content_hash
+from windseeker.parsing import parse_sysml
 
 
-def scan_folder(root_folder: str) -> Dict[str, str]:
+@contextmanager
+def _mapped(path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Map a file read-only (empty files cannot be mmapped and yield b"")."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _parse_packages(data: Union[mmap.mmap, bytes]) -> List[CachedPackage]:
+    # one pass yields every package's span, imports and views
+    return [
+        [
+            p.name,
+            p.start,
+            p.end,
+            content_hash(data[p.start : p.end]),
+            p.top_level_imports(),
+            p.qualified_views(),
+        ]
+        for p in parse_sysml(data).packages
+    ]
+
+
+# (packages, sha256, error) for one file
+ScanResult = Tuple[List[CachedPackage], str, Optional[str]]
+
+
+def _scan_file(path: Path) -> ScanResult:
     """
-    Recursively scan for .sysml files and return a map:
-      top_level_package_name -> full package declaration text
+    Read and parse a single .sysml file.
+
+    The file is memory-mapped and lexed as raw bytes, so neither a decoded copy of the
+    whole file nor a comment-stripped copy is ever built; only names are decoded, and
+    package text is described by its byte span instead of being copied out.
+
+    Returns (packages, sha256, error) where each package is
+    [name, start, end, content_hash, imports, views].
+    Runs inside worker processes when scanning in parallel, so it must stay a picklable
+    module-level function and must not print.
+    """
+    try:
+        with _mapped(path) as data:
+            packages = _parse_packages(data)
+            digest = file_digest(data)
+    except (OSError, UnicodeDecodeError) as e:
+        return [], "", str(e)
+
+    return packages, digest, None
+
+
+# files per pool task, and pool tasks in flight per worker
+_MAX_CHUNK = 64
+_CHUNKS_PER_WORKER = 2
+
+
+def _scan_files(paths: List[Path]) -> List[ScanResult]:
+    """_scan_file over a chunk of paths, so small files do not pay one round trip each."""
+    return [_scan_file(p) for p in paths]
+
+
+def _scan_in_pool(
+    pool: ProcessPoolExecutor, paths: List[Path], workers: int
+) -> Iterator[ScanResult]:
+    """
+    Parse paths in the pool and yield the results in path order.
+
+    Unlike pool.map, which submits every path up front and buffers whatever the consumer
+    has not taken yet, only workers * _CHUNKS_PER_WORKER chunks are in flight at a time; the
+    next chunk is submitted as each finished one is consumed.
+    """
+    size = max(1, min(_MAX_CHUNK, len(paths) // (workers * 4)))
+    chunks = (paths[i : i + size] for i in range(0, len(paths), size))
+    in_flight: Deque[Future] = deque()
+    for chunk in chunks:
+        in_flight.append(pool.submit(_scan_files, chunk))
+        if len(in_flight) >= workers * _CHUNKS_PER_WORKER:
+            yield from in_flight.popleft().result()
+    while in_flight:
+        yield from in_flight.popleft().result()
+
+
+def _resolve_jobs(jobs: int) -> int:
+    """Map the jobs option to a worker count (0 or negative = one per CPU)."""
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def _records(
+    path: Path, packages: List[CachedPackage], member: Optional[str] = None
+) -> Iterator[PackageRecord]:
+    source = os.path.abspath(path)
+    for pkg_name, start, end, digest, imports, views in packages:
+        yield PackageRecord(
+            name=pkg_name,
+            path=source,
+            start=start,
+            end=end,
+            content_hash=digest,
+            imports=tuple(imports),
+            views=tuple(views),
+            member=member,
+        )
+
+
+def _iter_archive_packages(archive: Path, rules: ScanRules) -> Iterator[PackageRecord]:
+    for member, data in iter_archive_sysml(archive, rules):
+        try:
+            packages = _parse_packages(data)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Warning: could not read {archive}!{member}: {e}")
+            continue
+        yield from _records(archive, packages, member)
+
+
+def iter_packages(
+    root_folder: str,
+    *,
+    jobs: int = 1,
+    cache: Optional[ParseCache] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+) -> Iterator[PackageRecord]:
+    """
+    Recursively scan for .sysml files and yield a PackageRecord per top-level package as
+    soon as the file defining it has been parsed.
+
+    Records are yielded in file discovery order, duplicates included (consumers decide;
+    scan_folder keeps the first). Serially only one file's packages are held at a time; in
+    parallel, parsed results are bounded by the few chunks in flight (see _scan_in_pool).
+    Callers such as build_import_graph_from_package_text can therefore consume the stream
+    while later files are still being read. Cache lookups are done up front: a hit only
+    refers to data the cache has already loaded.
+
+    root_folder may also be a .zip or .tar[.gz|.bz2|.xz] archive, whose .sysml members are
+    parsed straight from the archive (serially and without the parse cache).
+
+    jobs, cache, include and exclude behave as in scan_folder; the cache is saved when the
+    generator is exhausted or closed.
     """
     root = Path(root_folder)
     if not root.exists():
         raise FileNotFoundError(f"Folder does not exist: {root_folder}")
+    if root.is_file() and not is_archive(root):
+        raise NotADirectoryError(
+            f"Not a folder or a .zip/.tar[.gz|.bz2|.xz] archive: {root_folder}"
+        )
 
-    package_text: Dict[str, str] = {}
+    if is_archive(root):
+        rules = ScanRules(
+            include=tuple(include or ()), exclude=DEFAULT_EXCLUDES + tuple(exclude or ())
+        )
+        yield from _iter_archive_packages(root, rules)
+        return
 
-    for path in root.rglob("*.sysml"):
-        if not path.is_file():
-            continue
+    rules = ScanRules.for_root(root, include=include, exclude=exclude)
+    paths = list(walk_sysml_files(root, rules))
 
-        try:
-            text = path.read_text(encoding="utf-8", errors="replace")
-        except Exception as e:
-            print(f"Warning: could not read {path}: {e}")
-            continue
+    cached: List[Optional[List[CachedPackage]]] = [
+        cache.lookup(p) if cache is not None else None for p in paths
+    ]
+    todo = [p for p, hit in zip(paths, cached) if hit is None]
+
+    with ExitStack() as stack:
+        workers = min(_resolve_jobs(jobs), len(todo))
+        if workers > 1:
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            # results come back in path order, independent of completion order
+            parsed = _scan_in_pool(pool, todo, workers)
+        else:
+            parsed = (_scan_file(p) for p in todo)
+
+        if cache is not None:
+            stack.callback(cache.save)
 
-        clean_text = strip_line_comments(text)
+        for path, hit in zip(paths, cached):
+            if hit is not None:
+                packages = hit
+            else:
+                packages, sha256, error = next(parsed)
+                if error is not None:
+                    print(f"Warning: could not read {path}: {error}")
+                    continue
+                if cache is not None:
+                    cache.store(path, sha256=sha256, packages=packages)
 
-        for pkg_name, pkg_full_text in extract_top_level_packages_with_text(clean_text):
-            # keep first if duplicates occur
-            package_text.setdefault(pkg_name, pkg_full_text)
+            yield from _records(path, packages)
 
+
+def scan_folder(
+    root_folder: str,
+    *,
+    jobs: int = 1,
+    cache: Optional[ParseCache] = None,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+) -> PackageIndex:
+    """
+    Recursively scan for .sysml files (in a folder or a .zip/.tar archive, see iter_packages)
+    and return a map:
+      top_level_package_name -> full package declaration text
+
+    The returned PackageIndex holds a PackageRecord (source path, byte span, content hash,
+    imports, views) per package; text is only read back from disk when looked up.
+
+    With jobs != 1 files are parsed in a process pool (jobs <= 0 uses one worker per CPU).
+    Results are merged in file discovery order, so the first definition of a duplicated
+    package wins regardless of which worker finishes first.
+
+    If a ParseCache is given, unchanged files are served from it and only new or modified
+    files are read and parsed; the cache is saved before returning.
+
+    VCS, virtualenv and tool directories are skipped, as is anything matched by the glob
+    patterns in <root_folder>/.windseekerignore or exclude; if include globs are given only
+    matching .sysml files are read (see ScanRules). Excluded directories are never entered.
+    """
+    package_text = PackageIndex()
+    for record in iter_packages(
+        root_folder, jobs=jobs, cache=cache, include=include, exclude=exclude
+    ):
+        # keep first if duplicates occur
+        package_text.add(record)
     return package_text
@@ -4,9 +4,7 @@ import base64
 import io
 import re
 from pathlib import Path
-from typing import List
-
-import nbformat
+from typing import Any, Iterable, List, Mapping
 
 from windseeker.views.render import SvgRenderLimits, png_to_jpg, svg_to_png
 
@@ -27,9 +25,37 @@ def extract_view_images_from_executed_notebook(
     png_transparent_background: bool = True,
     png_background_color: str = "#ffffff",
     svg_limits: SvgRenderLimits = SvgRenderLimits(),
+) -> List[str]:
+    """Extract view outputs from an executed notebook file (see extract_view_images_from_cells)."""
+    import nbformat
+
+    nb = nbformat.read(executed_notebook_path, as_version=4)
+    return extract_view_images_from_cells(
+        nb.cells,
+        out_dir=out_dir,
+        write_svg=write_svg,
+        write_png=write_png,
+        write_jpg=write_jpg,
+        png_transparent_background=png_transparent_background,
+        png_background_color=png_background_color,
+        svg_limits=svg_limits,
+    )
+
+
+def extract_view_images_from_cells(
+    cells: Iterable[Mapping[str, Any]],
+    *,
+    out_dir: str = "views",
+    write_svg: bool = True,
+    write_png: bool = True,
+    write_jpg: bool = False,
+    png_transparent_background: bool = True,
+    png_background_color: str = "#ffffff",
+    svg_limits: SvgRenderLimits = SvgRenderLimits(),
 ) -> List[str]:
     """
-    Extract view outputs from an executed notebook and save them to disk.
+    Extract view outputs from executed notebook cells (file-backed or straight from an
+    in-process kernel run) and save them to disk.
 
     For each code cell whose source begins with:
         %view Fully::Qualified::ViewName
@@ -42,7 +68,6 @@ def extract_view_images_from_executed_notebook(
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
 
-    nb = nbformat.read(executed_notebook_path, as_version=4)
     written: List[str] = []
 
     def save_svg_and_renders(view_name: str, svg_text: str) -> None:
@@ -84,7 +109,7 @@ def extract_view_images_from_executed_notebook(
                 im.save(jpg_file, quality=95)
             written.append(str(jpg_file))
 
-    for cell_idx, cell in enumerate(nb.cells):
+    for cell_idx, cell in enumerate(cells):
         if cell.get("cell_type") != "code":
             continue
 
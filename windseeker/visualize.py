@@ -1,40 +1,230 @@
 from __future__ import annotations
 
-from typing import Tuple
+import json
+import math
+from html import escape
+from pathlib import Path
+from typing import IO, Callable, Dict, List, Tuple
 
-import matplotlib.pyplot as plt
 import networkx as nx
 
-from windseeker.graph import assert_acyclic_or_raise
+from windseeker.explorer import write_explorer_html
+from windseeker.graph import GraphAnalysis, GraphLike
+
+# Above this many nodes layout="auto" switches from kamada_kawai (O(n^2)) to "layered".
+AUTO_LAYERED_MIN_NODES = 200
+
+
+def layered_layout(G: GraphLike, *, sweeps: int = 4) -> Dict[str, Tuple[float, float]]:
+    """
+    Sugiyama-style layout of an acyclic import graph, roughly linear in nodes + edges.
+
+    Layers are the topological generations (dependencies at the bottom, y = 0), and the
+    order within each layer is improved by alternating down/up barycenter sweeps to reduce
+    edge crossings. x is spread over [-1, 1] per layer, y over [0, 1].
+    """
+    analysis = GraphAnalysis.of(G)
+    g = analysis.graph
+    layers: List[List[str]] = [list(layer) for layer in analysis.generations]
+    rank: Dict[str, float] = {}
+    for layer in layers:
+        for i, n in enumerate(layer):
+            rank[n] = i / max(1, len(layer) - 1)
+
+    def reorder(layer: List[str], neighbors) -> None:
+        def key(n: str) -> float:
+            ranks = [rank[m] for m in neighbors(n)]
+            return sum(ranks) / len(ranks) if ranks else rank[n]
+
+        layer.sort(key=key)
+        for i, n in enumerate(layer):
+            rank[n] = i / max(1, len(layer) - 1)
+
+    for _ in range(sweeps):
+        for layer in layers[1:]:
+            reorder(layer, g.successors)  # place importers above what they import
+        for layer in reversed(layers[:-1]):
+            reorder(layer, g.predecessors)
+
+    height = max(1, len(layers) - 1)
+    pos: Dict[str, Tuple[float, float]] = {}
+    for y, layer in enumerate(layers):
+        width = len(layer)
+        for i, n in enumerate(layer):
+            x = 0.0 if width == 1 else 2.0 * i / (width - 1) - 1.0
+            pos[n] = (x, y / height)
+    return pos
+
+
+def compute_layout(
+    G: GraphLike, layout: str = "auto", *, seed: int = 42
+) -> Dict[str, Tuple[float, float]]:
+    """Node positions for layout auto|layered|spring|kamada_kawai|shell."""
+    analysis = GraphAnalysis.of(G)
+    g = analysis.graph
+    if layout == "auto":
+        layout = "layered" if g.number_of_nodes() > AUTO_LAYERED_MIN_NODES else "kamada_kawai"
+
+    if layout == "layered":
+        return layered_layout(analysis)
+    if layout == "spring":
+        return nx.spring_layout(g, seed=seed)
+    if layout == "kamada_kawai":
+        return nx.kamada_kawai_layout(g)
+    if layout == "shell":
+        return nx.shell_layout(g)
+    raise ValueError(f"Unknown layout: {layout}")
+
+
+def graph_format_for(out_path: str, fmt: str | None = None) -> str:
+    """Explicit fmt, else the output file extension (".gv" counts as dot)."""
+    fmt = (fmt or Path(out_path).suffix.lstrip(".") or "png").lower()
+    return "dot" if fmt == "gv" else fmt
+
+
+def _canvas(
+    pos: Dict[str, Tuple[float, float]], nodes: int
+) -> Tuple[float, float, Callable[[str], Tuple[float, float]]]:
+    """Scale layout coordinates to SVG pixels (y flipped so dependencies end up at the bottom)."""
+    xs = [p[0] for p in pos.values()]
+    ys = [p[1] for p in pos.values()]
+    x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    width = max(800.0, 60.0 * math.sqrt(nodes) * 4)
+    height = max(600.0, 60.0 * math.sqrt(nodes) * 3)
+    margin = 60.0
+
+    def to_px(n: str) -> Tuple[float, float]:
+        x, y = pos[n]
+        px = margin + (x - x0) / ((x1 - x0) or 1.0) * (width - 2 * margin)
+        py = margin + (y1 - y) / ((y1 - y0) or 1.0) * (height - 2 * margin)
+        return round(px, 1), round(py, 1)
+
+    return width, height, to_px
+
+
+def _write_svg(G: nx.DiGraph, pos, f: IO[str], title: str | None) -> None:
+    width, height, to_px = _canvas(pos, G.number_of_nodes())
+    f.write(
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+        f'viewBox="0 0 {width:.0f} {height:.0f}" font-family="sans-serif" font-size="10">\n'
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="18" refY="5" markerWidth="6" '
+        'markerHeight="6" orient="auto"><path d="M0,0 L10,5 L0,10 z" fill="#555"/>'
+        "</marker></defs>\n"
+    )
+    if title:
+        f.write(f'<text x="{width / 2:.0f}" y="24" text-anchor="middle" font-size="16">')
+        f.write(f"{escape(title)}</text>\n")
+    f.write('<g stroke="#555" stroke-width="1" marker-end="url(#arrow)">\n')
+    for u, v in G.edges:
+        (x1, y1), (x2, y2) = to_px(u), to_px(v)
+        f.write(f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}"/>\n')
+    f.write("</g>\n<g>\n")
+    unresolved = G.graph.get("unresolved_imports", {}) or {}
+    for n in G.nodes:
+        x, y = to_px(n)
+        fill = "#f4cccc" if n in unresolved else "#cfe2f3"
+        label = escape(n)
+        f.write(
+            f'<g><title>{label}</title><circle cx="{x}" cy="{y}" r="8" fill="{fill}" '
+            f'stroke="#333"/><text x="{x}" y="{y - 12}" text-anchor="middle">{label}</text></g>\n'
+        )
+    f.write("</g>\n</svg>\n")
+
+
+def _dot_id(name: str) -> str:
+    return '"' + name.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _write_dot(G: nx.DiGraph, pos, f: IO[str], title: str | None) -> None:
+    f.write("digraph imports {\n")
+    if title:
+        f.write(f"  label={_dot_id(title)};\n")
+    f.write("  node [shape=box];\n")
+    for n in G.nodes:
+        x, y = pos[n]
+        # scaled to points; honored by `neato -n`, ignored by dot
+        f.write(f'  {_dot_id(n)} [pos="{x * 500:.1f},{y * 500:.1f}"];\n')
+    for u, v in G.edges:
+        f.write(f"  {_dot_id(u)} -> {_dot_id(v)};\n")
+    f.write("}\n")
+
+
+def _write_graphml(G: nx.DiGraph, pos, f: IO[str], title: str | None) -> None:
+    f.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        '  <key id="x" for="node" attr.name="x" attr.type="double"/>\n'
+        '  <key id="y" for="node" attr.name="y" attr.type="double"/>\n'
+        '  <graph id="imports" edgedefault="directed">\n'
+    )
+    for n in G.nodes:
+        x, y = pos[n]
+        f.write(
+            f'    <node id="{escape(n)}"><data key="x">{x}</data><data key="y">{y}</data></node>\n'
+        )
+    for u, v in G.edges:
+        f.write(f'    <edge source="{escape(u)}" target="{escape(v)}"/>\n')
+    f.write("  </graph>\n</graphml>\n")
+
+
+def _write_json(G: nx.DiGraph, pos, f: IO[str], title: str | None) -> None:
+    f.write('{"title": ' + json.dumps(title) + ', "nodes": [')
+    for i, n in enumerate(G.nodes):
+        x, y = pos[n]
+        f.write(("," if i else "") + "\n  " + json.dumps({"id": n, "x": x, "y": y}))
+    f.write('\n], "edges": [')
+    for i, (u, v) in enumerate(G.edges):
+        f.write(("," if i else "") + "\n  " + json.dumps([u, v]))
+    f.write("\n]}\n")
+
+
+# Written directly (no matplotlib); any other format is rendered by matplotlib.
+_WRITERS = {
+    "svg": _write_svg,
+    "dot": _write_dot,
+    "graphml": _write_graphml,
+    "json": _write_json,
+    "html": write_explorer_html,
+}
 
 
 def visualize_graph_to_file(
-    G: nx.DiGraph,
+    G: GraphLike,
     out_path: str,
     *,
     title: str | None = "SysML Package Import Graph",
     figsize: Tuple[float, float] = (16, 10),
     dpi: int = 200,
-    layout: str = "kamada_kawai",  # spring|kamada_kawai|shell
+    layout: str = "auto",  # auto|layered|spring|kamada_kawai|shell
     seed: int = 42,
+    fmt: str | None = None,  # png|svg|dot|graphml|json|html|...; default: from out_path
 ) -> None:
     """
-    Write a NetworkX visualization to an image file.
-    Refuses to write if there are cycles (critical recursion loop).
+    Write the import graph to a file.
+
+    svg, dot, graphml, json and html (an interactive explorer, see windseeker.explorer) are
+    streamed straight to the file (positions from the chosen layout) without importing
+    matplotlib; anything else (png, pdf, ...) is rendered with
+    matplotlib. Refuses to write if there are cycles (critical recursion loop).
+    G may be a GraphAnalysis, whose memoized cycle check is then reused.
     """
-    assert_acyclic_or_raise(G)
+    analysis = GraphAnalysis.of(G)
+    analysis.assert_acyclic()
+    G = analysis.graph
 
     if G.number_of_nodes() == 0:
         raise ValueError("Graph is empty: no packages/imports found.")
 
-    if layout == "spring":
-        pos = nx.spring_layout(G, seed=seed)
-    elif layout == "kamada_kawai":
-        pos = nx.kamada_kawai_layout(G)
-    elif layout == "shell":
-        pos = nx.shell_layout(G)
-    else:
-        raise ValueError(f"Unknown layout: {layout}")
+    fmt = graph_format_for(out_path, fmt)
+    pos = compute_layout(analysis, layout, seed=seed)
+
+    writer = _WRITERS.get(fmt)
+    if writer is not None:
+        with open(out_path, "w", encoding="utf-8") as f:
+            writer(G, pos, f, title)
+        return
+
+    import matplotlib.pyplot as plt
 
     plt.figure(figsize=figsize)
     if title:
@@ -46,5 +236,5 @@ def visualize_graph_to_file(
 
     plt.axis("off")
     plt.tight_layout()
-    plt.savefig(out_path, dpi=dpi)
+    plt.savefig(out_path, dpi=dpi, format=fmt)
     plt.close()